@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import traceback
+from typing import Callable, List, Optional, Set
+
+from .eyes import CoalescingMap
+
+
+class TheChoir:
+    """
+    The Choir. An asyncio pipeline between the Eyes and the rest of the Angel.
+
+    Filesystem events arrive from watchdog's thread through `submit()` and
+    land in an asyncio.Queue on the Choir's own loop. Debouncing is per path
+    (a CoalescingMap) driven by one loop timer armed for the earliest
+    deadline - no thread per event, and a burst across many files yields
+    one work unit per file. Each settled batch of paths then goes through:
+      1. `analyze(paths)` in a worker thread, at most `max_concurrency`
+         batches at a time (git + brain are blocking); it returns the
+         input for the next stage, or None to stop there.
+      2. `confirm(result)` in a worker thread, one batch at a time - it
+         owns the terminal (human confirmation) and the graph mutation.
+    Rendering stays with RenderWorker, which confirm() only pokes.
+    """
+
+    def __init__(
+        self,
+        analyze: Callable,
+        confirm: Callable,
+        debounce_interval: float = 2.0,
+        max_concurrency: int = 4
+    ):
+        self.analyze = analyze
+        self.confirm = confirm
+        self.debounce_interval = debounce_interval
+        self.max_concurrency = max(1, max_concurrency)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending = CoalescingMap(debounce_interval)
+
+        # --- METRICS ---
+        self.received = 0
+        self.processed = 0
+        self.errors = 0
+
+    # --- LIFECYCLE ---
+
+    def start(self):
+        """Run the pipeline loop on a background thread."""
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), name="angel-choir", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, flush: bool = True, timeout: Optional[float] = None):
+        """Stop accepting events; with `flush`, finish anything debounced or in flight first."""
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, _Stop(flush))
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, path: str):
+        """Thread-safe entry point for watchdog callbacks."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, path)
+
+    def metrics(self) -> dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "in_flight": len(self._tasks),
+            "errors": self.errors
+        }
+
+    # --- THE PIPELINE ---
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._analysis_slots = asyncio.Semaphore(self.max_concurrency)
+        self._confirmation = asyncio.Lock()
+        self._ready.set()
+
+        while True:
+            item = await self._queue.get()
+            if isinstance(item, _Stop):
+                if self._timer is not None:
+                    self._timer.cancel()
+                if item.flush:
+                    self._dispatch(self._pending.drain())
+                    if self._tasks:
+                        await asyncio.gather(*self._tasks, return_exceptions=True)
+                return
+
+            # Debounce per path: re-touching a file pushes only its own deadline back
+            self.received += 1
+            self._pending.touch(item, self._loop.time())
+            if self._timer is None:
+                self._arm()
+
+    def _arm(self):
+        """Schedule a wake-up for the earliest pending deadline."""
+        deadline = self._pending.next_deadline()
+        self._timer = None if deadline is None else self._loop.call_at(deadline, self._release)
+
+    def _release(self):
+        self._dispatch(self._pending.pop_due(self._loop.time()))
+        self._arm()
+
+    def _dispatch(self, paths: List[str]):
+        if not paths:
+            return
+        task = self._loop.create_task(self._process(paths))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, paths: List[str]):
+        try:
+            async with self._analysis_slots:
+                result = await asyncio.to_thread(self.analyze, paths)
+            if result is None:
+                return
+            async with self._confirmation:
+                await asyncio.to_thread(self.confirm, result)
+            self.processed += len(paths)
+        except Exception:
+            self.errors += 1
+            traceback.print_exc()
+
+
+class _Stop:
+    def __init__(self, flush: bool):
+        self.flush = flush
@@ -1,19 +1,141 @@
+import atexit
 import json
+import mmap
 import os
-from typing import List, Optional
+import re
+import threading
+from bisect import bisect_right
+from itertools import islice
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from .types import AngelEvent
 
+# Cheap timestamp extraction for index maintenance (avoids full JSON decode)
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+_EVENT_ID_RE = re.compile(rb'"event_id"\s*:\s*"([^"]*)"')
+_ACTION_TYPE_RE = re.compile(rb'"action_type"\s*:\s*"([^"]*)"')
+
+# A place in the chronicles: (segment sequence number, byte offset)
+Position = Tuple[int, int]
+
+# How hard each group commit pushes data towards the disk
+DURABILITY_POLICIES = ("none", "flush", "fsync-per-batch")
+
+
+class _SegmentIndex:
+    """
+    Sparse timestamp -> byte-offset checkpoints for one segment.
+    Every Nth event's offset is paired with the highest timestamp seen
+    *before* it, so seeking stays correct even if the clock steps backwards.
+    """
+
+    def __init__(self, stride: int, floor: str = ""):
+        self.stride = stride
+        self.offsets: List[int] = []
+        self.floors: List[str] = []
+        self.since_checkpoint = 0
+        self.max_timestamp = floor
+        self.size = 0
+
+    def note(self, offset: int, timestamp: str) -> Optional[Tuple[int, str]]:
+        """Track an event; returns the new checkpoint if one was taken."""
+        checkpoint = None
+        if not self.offsets or self.since_checkpoint >= self.stride:
+            checkpoint = (offset, self.max_timestamp)
+            self.offsets.append(offset)
+            self.floors.append(self.max_timestamp)
+            self.since_checkpoint = 0
+        self.since_checkpoint += 1
+        if timestamp > self.max_timestamp:
+            self.max_timestamp = timestamp
+        return checkpoint
+
+    def note_raw_line(self, offset: int, line: bytes) -> Optional[Tuple[int, str]]:
+        if not line.strip():
+            return None
+        match = _TIMESTAMP_RE.search(line)
+        timestamp = match.group(1).decode("utf-8", errors="replace") if match else ""
+        return self.note(offset, timestamp)
+
+    def seek(self, timestamp: str) -> int:
+        """Byte offset from which every event newer than `timestamp` is found."""
+        if not self.offsets:
+            return 0
+        # Last checkpoint whose preceding events are all <= timestamp
+        i = bisect_right(self.floors, timestamp) - 1
+        return self.offsets[max(i, 0)]
+
+    @property
+    def first_floor(self) -> str:
+        return self.floors[0] if self.floors else self.max_timestamp
+
 
 class TheScribe:
     """
     The Chronicles keeper. Handles append-only JSONL event storage.
     This is the ground truth - everything else is derived.
+
+    The log is split into segments: `angel_chronicles.jsonl` is the active
+    one, and once it outgrows `segment_max_bytes` it is sealed as
+    `angel_chronicles.000001.jsonl` (and so on). Sealed segments never change,
+    so old ones can be archived once a snapshot covers them.
+
+    Writes are group-committed through one long-lived append handle: events
+    are buffered and written once `batch_size` accumulate or `flush_interval`
+    seconds pass, whichever comes first. `durability` picks what a commit does:
+      - none:            hand the batch to the file object (flushed on read/close)
+      - flush:           push each batch to the OS (survives a process crash)
+      - fsync-per-batch: also fsync each batch (survives power loss)
+    The Scribe assumes it is the only writer while its handle is open.
     """
 
-    def __init__(self, chronicles_path: str = "angel_chronicles.jsonl"):
+    def __init__(
+        self,
+        chronicles_path: str = "angel_chronicles.jsonl",
+        index_stride: int = 256,
+        segment_max_bytes: int = 0,
+        snapshot_path: str = "angel_state.json",
+        snapshot_every: int = 500,
+        durability: str = "flush",
+        batch_size: int = 64,
+        flush_interval: float = 0.5
+    ):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"durability must be one of {DURABILITY_POLICIES}, got {durability!r}")
+
         self.chronicles_path = Path(chronicles_path)
+        self.index_path = self._index_path_for(self.chronicles_path)
+        self.counts_path = self.chronicles_path.with_name(self.chronicles_path.name + ".counts.json")
+        self.index_stride = max(1, int(index_stride))
+        self.segment_max_bytes = int(segment_max_bytes or 0)
+        self.snapshot_path = Path(snapshot_path)
+        self.snapshot_every = int(snapshot_every or 0)
+        self.durability = durability
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self._lock = threading.RLock()
+
+        self._handle = None
+        self._pending: List[bytes] = []
+        self._pending_checkpoints: List[Tuple[int, str]] = []
+        self._flush_timer: Optional[threading.Timer] = None
+
         self._ensure_chronicles_exist()
+        self._sealed: List[int] = self._discover_segments()
+        self._sealed_index: Dict[int, _SegmentIndex] = {}
+        self._active_seq = self._sealed[-1] + 1 if self._sealed else 1
+
+        self._events_since_snapshot = 0
+        self._rolled_since_snapshot = False
+        self._snapshot_position: Optional[Position] = None
+
+        self._index = _SegmentIndex(self.index_stride)
+        self._load_index()
+
+        # Per-segment {"size", "count", "actions"}; trusted while "size" matches the file
+        self._counts: Dict[int, dict] = self._load_counts()
+        atexit.register(self.close)
 
     def _ensure_chronicles_exist(self):
         """Create the chronicles file if it doesn't exist."""
@@ -23,10 +145,100 @@ class TheScribe:
     def record(self, event: AngelEvent) -> None:
         """
         Append an event to the chronicles.
-        Atomic write - each event is one line.
+        Each event is one line; it reaches the file with the next group commit.
         """
-        with open(self.chronicles_path, "a", encoding="utf-8") as f:
-            f.write(event.model_dump_json() + "\n")
+        with self._lock:
+            self._append_locked(event)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def record_many(self, events: Iterable[AngelEvent]) -> None:
+        """Append a batch of events as a single group commit."""
+        with self._lock:
+            for event in events:
+                self._append_locked(event)
+            self._flush_locked()
+
+    def _append_locked(self, event: AngelEvent) -> None:
+        """Buffer one event for the next group commit (caller holds the lock)."""
+        line = (event.model_dump_json() + "\n").encode("utf-8")
+        if self.segment_max_bytes and self._index.size >= self.segment_max_bytes:
+            self._flush_locked()
+            self._roll_segment()
+        self._open_handle()
+
+        offset = self._index.size
+        checkpoint = self._index.note(offset, event.timestamp)
+        if checkpoint is not None:
+            self._pending_checkpoints.append(checkpoint)
+        self._index.size = offset + len(line)
+        self._pending.append(line)
+        self._events_since_snapshot += 1
+
+        counts = self._counts.setdefault(self._active_seq, self._empty_counts())
+        if counts.get("tail"):
+            # The unterminated last line on disk becomes part of this one
+            counts["count"] -= 1
+            counts["tail"] = 0
+        counts["count"] += 1
+        counts["actions"][event.action_type] = counts["actions"].get(event.action_type, 0) + 1
+        counts["size"] = self._index.size
+
+    def flush(self) -> None:
+        """Commit any buffered events and push them to the OS."""
+        with self._lock:
+            self._flush_locked()
+            if self._handle is not None:
+                self._handle.flush()
+
+    def close(self) -> None:
+        """Flush everything and release the append handle. Safe to call twice."""
+        with self._lock:
+            self._flush_locked()
+            if self._handle is not None:
+                self._handle.flush()
+                if self.durability == "fsync-per-batch":
+                    os.fsync(self._handle.fileno())
+                self._handle.close()
+                self._handle = None
+
+    def _open_handle(self) -> None:
+        if self._handle is not None:
+            return
+        self._handle = open(self.chronicles_path, "ab")
+        size = self._handle.tell()
+        if size != self._index.size:
+            # Someone else appended (or truncated) while we weren't holding the file
+            self._catch_up_index()
+        counts = self._counts.get(self._active_seq)
+        if counts is None or counts["size"] != size:
+            resume = counts if counts is not None and counts["size"] < size else None
+            self._counts[self._active_seq] = self._count_segment(self.chronicles_path, resume)
+
+    def _flush_locked(self) -> None:
+        """Write the pending batch as one group commit (caller holds the lock)."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+
+        self._handle.write(b"".join(self._pending))
+        self._pending = []
+        if self.durability != "none":
+            self._handle.flush()
+            if self.durability == "fsync-per-batch":
+                os.fsync(self._handle.fileno())
+
+        # Checkpoints and counters only land once the lines they describe are written
+        for checkpoint in self._pending_checkpoints:
+            self._persist_checkpoint(checkpoint)
+        self._pending_checkpoints = []
+        self._write_counts()
 
     def read_all(self, limit: int = 1000) -> List[AngelEvent]:
         """
@@ -43,71 +255,560 @@ class TheScribe:
         if not self.chronicles_path.exists():
             return events
 
-        for line in self._read_tail_lines(limit):
-            line = line.strip()
-            if not line:
-                continue
+        self.flush()
+        lines = list(islice(self._iter_tail_lines(), limit))
+        for line in reversed(lines):
             try:
-                data = json.loads(line)
-                events.append(AngelEvent(**data))
-            except (json.JSONDecodeError, ValueError):
+                events.append(self._decode(line))
+            except ValueError:
                 continue
         return events
 
     def read_since(self, timestamp: str) -> List[AngelEvent]:
-        """Read events after a given timestamp."""
+        """
+        Read events after a given timestamp.
+        Seeks via the sparse index so only the matching tail is parsed.
+        """
         events: List[AngelEvent] = []
         if not self.chronicles_path.exists():
             return events
 
-        with open(self.chronicles_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    event = AngelEvent(**data)
-                except (json.JSONDecodeError, ValueError):
-                    continue
-                if event.timestamp > timestamp:
-                    events.append(event)
+        with self._lock:
+            start = self._seek_position(timestamp)
+
+        for event in self.iter_events(start=start):
+            if event.timestamp > timestamp:
+                events.append(event)
         return events
 
-    def _read_tail_lines(self, limit: int, chunk_size: int = 4096) -> List[str]:
-        if limit <= 0:
-            return []
+    def iter_events(
+        self,
+        start: Optional[Position] = None,
+        action_types: Optional[Iterable[str]] = None
+    ) -> Iterator[AngelEvent]:
+        """
+        Stream events in order, optionally starting from a position
+        (e.g. the one stored alongside a snapshot).
+        With `action_types`, other lines are skipped by a raw substring
+        check before any JSON decoding or validation happens.
+        """
+        for _, event in self.iter_records(start, action_types):
+            yield event
+
+    def iter_records(
+        self,
+        start: Optional[Position] = None,
+        action_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Position, AngelEvent]]:
+        """Like iter_events, but pairs each event with the position just after it."""
+        wanted = set(action_types) if action_types else None
+        needles = [f'"{action_type}"'.encode("utf-8") for action_type in wanted] if wanted else None
+
+        for position, line in self._iter_lines(start):
+            if needles and not any(needle in line for needle in needles):
+                continue
+            try:
+                event = self._decode(line)
+            except ValueError:
+                continue
+            if wanted is None or event.action_type in wanted:
+                yield position, event
+
+    def export_columnar(self, directory: Optional[str] = None) -> int:
+        """
+        Append everything recorded since the last export to the columnar
+        store (default: angel_chronicles.columnar/ next to the log).
+        Returns the number of events exported. Requires numpy.
+        """
+        from .tablets import TheTablets
+
+        if directory is None:
+            directory = self.chronicles_path.with_name(self.chronicles_path.stem + ".columnar")
+        return TheTablets(directory).export(self)
+
+    @staticmethod
+    def _decode(line) -> AngelEvent:
+        """
+        Parse and validate one chronicle line in a single pass inside
+        pydantic-core (no intermediate dict, no Python-level validation).
+        Raises ValueError (ValidationError) on malformed or invalid lines.
+        """
+        return AngelEvent.model_validate_json(line)
 
-        with open(self.chronicles_path, "rb") as f:
-            f.seek(0, os.SEEK_END)
-            position = f.tell()
-            buffer = b""
-            lines: List[bytes] = []
+    def _iter_lines(self, start: Optional[Position] = None) -> Iterator[Tuple[Position, bytes]]:
+        """Yield (position after line, raw line) across segments."""
+        self.flush()
+        start_seq, start_offset = start or (0, 0)
+        for seq, path in self._segment_files():
+            if seq < start_seq:
+                continue
+            offset = start_offset if seq == start_seq else 0
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                f.seek(offset)
+                for line in f:
+                    offset += len(line)
+                    line = line.strip()
+                    if line:
+                        yield (seq, offset), line
 
-            while position > 0 and len(lines) <= limit:
-                read_size = min(chunk_size, position)
-                position -= read_size
-                f.seek(position)
-                chunk = f.read(read_size)
-                buffer = chunk + buffer
-                lines = buffer.splitlines()
+    def _iter_tail_lines(self, end: Optional[Position] = None) -> Iterator[bytes]:
+        """
+        Yield non-empty raw lines newest first, across segments, optionally
+        starting from (and excluding anything after) `end`.
+        Stops at the first missing segment - history before a gap is archived.
+        """
+        end_seq, end_offset = end or (self._active_seq, None)
+        for seq, path in reversed(self._segment_files()):
+            if seq > end_seq:
+                continue
+            try:
+                yield from self._iter_segment_reversed(path, end_offset if seq == end_seq else None)
+            except FileNotFoundError:
+                return
 
-            tail = lines[-limit:]
-            return [line.decode("utf-8", errors="replace") for line in tail]
+    @staticmethod
+    def _iter_segment_reversed(path: Path, end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Walk one segment backwards through a read-only memory map.
+        Each step is a single rfind, so a tail of N lines costs O(bytes read)
+        and only the yielded lines are copied.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if end is None else min(end, size)
+            if end <= 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while end > 0:
+                    start = mm.rfind(b"\n", 0, end) + 1
+                    line = mm[start:end].strip()
+                    if line:
+                        yield line
+                    end = start - 1
+
+    def end_position(self) -> Position:
+        """Position just past the last committed event (flushes pending ones first)."""
+        with self._lock:
+            self.flush()
+            try:
+                size = self.chronicles_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            return self._active_seq, size
+
+    def position_after(self, event_id: str) -> Optional[Position]:
+        """
+        Position just after the event with `event_id` (to resume a reader
+        from it), or None if no such event is in the retained segments.
+        Lines are matched by raw substring before any decoding.
+        """
+        needle = event_id.encode("utf-8")
+        for position, line in self._iter_lines():
+            if needle not in line:
+                continue
+            match = _EVENT_ID_RE.search(line)
+            if match and match.group(1) == needle:
+                return position
+        return None
+
+    def refresh(self) -> None:
+        """
+        Pick up segments sealed by another process. Only needed by
+        read-only followers; the writing Scribe tracks its own rolls.
+        """
+        with self._lock:
+            if self._handle is not None:
+                return
+            sealed = self._discover_segments()
+            if sealed != self._sealed:
+                self._sealed = sealed
+                self._active_seq = sealed[-1] + 1 if sealed else 1
+                self._sealed_index.clear()
+                self._index = _SegmentIndex(self.index_stride)
+                self._load_index()
 
     def get_last_event(self) -> Optional[AngelEvent]:
         """Get the most recent event."""
-        events = self.read_all(limit=1)
-        return events[-1] if events else None
+        self.flush()
+        for line in self._iter_tail_lines():
+            try:
+                return self._decode(line)
+            except ValueError:
+                continue
+        return None
 
     def count(self) -> int:
-        """Count total events in the chronicles."""
-        if not self.chronicles_path.exists():
-            return 0
+        """
+        Count total events in the chronicles.
+        O(1) per segment while the counters sidecar matches the files on disk.
+        """
+        return sum(counts["count"] for counts in self._verified_counts())
+
+    def count_by_action(self) -> Dict[str, int]:
+        """Event totals per action_type, from the same maintained counters."""
+        totals: Dict[str, int] = {}
+        for counts in self._verified_counts():
+            for action_type, n in counts["actions"].items():
+                totals[action_type] = totals.get(action_type, 0) + n
+        return totals
+
+    # --- COUNTERS (*.jsonl.counts.json) ---
+
+    @staticmethod
+    def _empty_counts() -> dict:
+        return {"size": 0, "count": 0, "actions": {}, "tail": 0}
+
+    def _verified_counts(self) -> List[dict]:
+        """Counters for every segment, recounting any whose size no longer matches."""
+        self.flush()
+        with self._lock:
+            segments = []
+            changed = False
+            for seq, path in self._segment_files():
+                try:
+                    size = path.stat().st_size
+                except FileNotFoundError:
+                    # Archived - no longer part of the chronicles
+                    changed |= self._counts.pop(seq, None) is not None
+                    continue
+
+                counts = self._counts.get(seq)
+                if counts is None or counts["size"] != size:
+                    # Appended behind our back: count only the new bytes; otherwise start over
+                    resume = counts if counts is not None and counts["size"] < size else None
+                    counts = self._count_segment(path, resume)
+                    self._counts[seq] = counts
+                    changed = True
+                segments.append(counts)
+
+            if changed:
+                self._write_counts()
+            return segments
+
+    @staticmethod
+    def _count_segment(path: Path, counts: Optional[dict] = None, chunk_size: int = 1 << 20) -> dict:
+        """
+        Count events (non-blank lines) by scanning raw bytes in large chunks,
+        with a regex for action types - without decoding any text. A final
+        line without its newline is counted too and remembered as the
+        `tail`, so resuming later re-reads it instead of counting it twice.
+        """
+        counts = counts or TheScribe._empty_counts()
+        actions = dict(counts["actions"])
+        total = counts["count"]
+        with open(path, "rb") as f:
+            position = counts["size"] - counts.get("tail", 0)
+            f.seek(position)
+            carry = b""
+            if counts.get("tail"):
+                # Un-count the unterminated line; it is rescanned with what follows it
+                carry = f.read(counts["tail"])
+                total -= 1
+                for match in _ACTION_TYPE_RE.finditer(carry):
+                    action_type = match.group(1).decode("utf-8", errors="replace")
+                    actions[action_type] -= 1
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                chunk = carry + chunk
+                # Only complete lines here; a torn tail waits for its newline
+                cut = chunk.rfind(b"\n") + 1
+                body, carry = chunk[:cut], chunk[cut:]
+                total += sum(1 for line in body.split(b"\n") if line.strip())
+                for match in _ACTION_TYPE_RE.finditer(body):
+                    action_type = match.group(1).decode("utf-8", errors="replace")
+                    actions[action_type] = actions.get(action_type, 0) + 1
+                position += len(body)
+
+        tail = 0
+        if carry.strip():
+            total += 1
+            for match in _ACTION_TYPE_RE.finditer(carry):
+                action_type = match.group(1).decode("utf-8", errors="replace")
+                actions[action_type] = actions.get(action_type, 0) + 1
+            tail = len(carry)
+            position += tail
+        return {"size": position, "count": total, "actions": actions, "tail": tail}
+
+    def _load_counts(self) -> Dict[int, dict]:
+        if not self.counts_path.exists():
+            return {}
+        try:
+            with open(self.counts_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                int(seq): {
+                    "size": int(counts["size"]),
+                    "count": int(counts["count"]),
+                    "actions": {str(k): int(v) for k, v in counts["actions"].items()},
+                    "tail": int(counts.get("tail", 0))
+                }
+                for seq, counts in data.get("segments", {}).items()
+            }
+        except (json.JSONDecodeError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+    def _write_counts(self) -> None:
+        payload = {"segments": {str(seq): counts for seq, counts in self._counts.items()}}
+        tmp_path = self.counts_path.with_name(self.counts_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.counts_path)
+
+    # --- SEGMENTS ---
+
+    def _segment_path(self, seq: int) -> Path:
+        path = self.chronicles_path
+        return path.with_name(f"{path.stem}.{seq:06d}{path.suffix}")
+
+    @staticmethod
+    def _index_path_for(path: Path) -> Path:
+        return path.with_name(path.name + ".idx")
+
+    def _discover_segments(self) -> List[int]:
+        path = self.chronicles_path
+        pattern = re.compile(rf"^{re.escape(path.stem)}\.(\d{{6}}){re.escape(path.suffix)}$")
+        seqs = []
+        for candidate in path.parent.glob(f"{path.stem}.*{path.suffix}"):
+            match = pattern.match(candidate.name)
+            if match:
+                seqs.append(int(match.group(1)))
+        return sorted(seqs)
 
-        count = 0
-        with open(self.chronicles_path, "r", encoding="utf-8") as f:
+    def _segment_files(self) -> List[Tuple[int, Path]]:
+        """All segments in order, sealed first, the active one last."""
+        files = [(seq, self._segment_path(seq)) for seq in self._sealed]
+        files.append((self._active_seq, self.chronicles_path))
+        return files
+
+    def _roll_segment(self) -> None:
+        """Seal the active segment and start a fresh one."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        sealed_path = self._segment_path(self._active_seq)
+        os.replace(self.chronicles_path, sealed_path)
+        if self.index_path.exists():
+            os.replace(self.index_path, self._index_path_for(sealed_path))
+
+        self._sealed.append(self._active_seq)
+        self._sealed_index[self._active_seq] = self._index
+        self._active_seq += 1
+        self._rolled_since_snapshot = True
+
+        self.chronicles_path.touch()
+        self.index_path.write_text("", encoding="utf-8")
+        self._index = _SegmentIndex(self.index_stride, floor=self._index.max_timestamp)
+
+    def archivable_segments(self) -> List[Path]:
+        """Sealed segments fully covered by the latest snapshot (safe to archive)."""
+        if self._snapshot_position is None:
+            return []
+        covered_seq, _ = self._snapshot_position
+        return [self._segment_path(seq) for seq in self._sealed if seq < covered_seq]
+
+    # --- SNAPSHOTS (angel_state.json) ---
+
+    def snapshot_due(self) -> bool:
+        """True once enough events (or a segment roll) have passed since the last snapshot."""
+        if self._rolled_since_snapshot:
+            return True
+        return bool(self.snapshot_every) and self._events_since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, state: dict) -> None:
+        """
+        Persist a compacted derived state, keyed by the last event it covers.
+        Atomic write - temp file + rename.
+        """
+        with self._lock:
+            self.flush()
+            position = (self._active_seq, self._index.size)
+            last_event_id = self._event_id_before(position)
+            self._events_since_snapshot = 0
+            self._rolled_since_snapshot = False
+
+        payload = {
+            "last_event_id": last_event_id,
+            "segment": position[0],
+            "offset": position[1],
+            "written_at": datetime.now().isoformat(),
+            "state": state
+        }
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_position = position
+
+    def load_snapshot(self) -> Optional[Tuple[dict, Position]]:
+        """
+        Load the latest snapshot and the position to resume replay from.
+        Returns None if missing or if it no longer matches the chronicles.
+        """
+        if not self.snapshot_path.exists():
+            return None
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            position = (int(payload["segment"]), int(payload["offset"]))
+            state = payload["state"]
+            last_event_id = payload.get("last_event_id")
+        except (json.JSONDecodeError, ValueError, TypeError, KeyError):
+            return None
+
+        if not self._snapshot_matches(position, last_event_id):
+            return None
+
+        self._snapshot_position = position
+        return state, position
+
+    def _snapshot_matches(self, position: Position, last_event_id: Optional[str]) -> bool:
+        seq, offset = position
+        if seq != self._active_seq and seq not in self._sealed:
+            # Covered segment was archived - trust it if history continues after it
+            return seq < self._active_seq
+        return self._event_id_before(position) == last_event_id
+
+    def _event_id_before(self, position: Position) -> Optional[str]:
+        """event_id of the last event ending at or before `position`."""
+        for line in self._iter_tail_lines(end=position):
+            match = _EVENT_ID_RE.search(line)
+            if match:
+                return match.group(1).decode("utf-8", errors="replace")
+        return None
+
+    # --- SPARSE INDEX (*.jsonl.idx) ---
+
+    def rebuild_index(self) -> None:
+        """Rebuild the active segment's timestamp -> byte-offset index from the log."""
+        with self._lock:
+            self.flush()
+            self._rebuild_index()
+
+    def _seek_position(self, timestamp: str) -> Position:
+        """Position from which every event newer than `timestamp` is found."""
+        if self._index.first_floor <= timestamp or not self._sealed:
+            return self._active_seq, self._index.seek(timestamp)
+
+        # Walk back to the newest sealed segment that starts at or before it
+        for seq in reversed(self._sealed):
+            index = self._load_sealed_index(seq)
+            if index is None:
+                return seq, 0
+            if index.first_floor <= timestamp:
+                return seq, index.seek(timestamp)
+        return self._sealed[0], 0
+
+    def _load_sealed_index(self, seq: int) -> Optional[_SegmentIndex]:
+        if seq in self._sealed_index:
+            return self._sealed_index[seq]
+        path = self._segment_path(seq)
+        if not path.exists():
+            return None
+        index = self._read_index_file(self._index_path_for(path))
+        if index is None or not self._index_is_valid(path, index):
+            # Missing or damaged: rescan, seeded from the segment before it
+            position = self._sealed.index(seq)
+            floor = ""
+            if position > 0:
+                previous = self._load_sealed_index(self._sealed[position - 1])
+                floor = previous.max_timestamp if previous else ""
+            index = self._scan_segment(path, _SegmentIndex(self.index_stride, floor))
+            self._write_index_file(self._index_path_for(path), index)
+        else:
+            self._scan_segment(path, index)
+        self._sealed_index[seq] = index
+        return index
+
+    def _load_index(self) -> None:
+        """Load the active index sidecar, rebuilding it if missing or stale."""
+        index = self._read_index_file(self.index_path)
+        if index is None or not self._index_is_valid(self.chronicles_path, index):
+            self._rebuild_index()
+            return
+
+        self._index = index
+        self._catch_up_index()
+
+    def _read_index_file(self, path: Path) -> Optional[_SegmentIndex]:
+        if not path.exists():
+            return None
+        index = _SegmentIndex(self.index_stride)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        offset, floor = json.loads(line)
+                        index.offsets.append(int(offset))
+                        index.floors.append(str(floor))
+        except (json.JSONDecodeError, ValueError, TypeError):
+            return None
+        if not index.offsets:
+            return None
+        index.max_timestamp = index.floors[-1]
+        index.size = index.offsets[-1]
+        return index
+
+    def _write_index_file(self, path: Path, index: _SegmentIndex) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in zip(index.offsets, index.floors):
+                f.write(json.dumps(list(entry)) + "\n")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _index_is_valid(path: Path, index: _SegmentIndex) -> bool:
+        if index.offsets[0] != 0:
+            return False
+        last_offset = index.offsets[-1]
+        if last_offset >= path.stat().st_size:
+            return False
+        if last_offset == 0:
+            return True
+        # A checkpoint must sit at the start of a line
+        with open(path, "rb") as f:
+            f.seek(last_offset - 1)
+            return f.read(1) == b"\n"
+
+    def _scan_segment(self, path: Path, index: _SegmentIndex, persist: bool = False) -> _SegmentIndex:
+        """Feed every line after `index.size` into the index."""
+        with open(path, "rb") as f:
+            f.seek(index.size)
+            offset = index.size
             for line in f:
-                if line.strip():
-                    count += 1
-        return count
+                checkpoint = index.note_raw_line(offset, line)
+                if persist:
+                    self._persist_checkpoint(checkpoint)
+                offset += len(line)
+            index.size = offset
+        return index
+
+    def _catch_up_index(self) -> None:
+        """Index any events appended after our last known end of the active segment."""
+        if self.chronicles_path.stat().st_size < self._index.size:
+            # Truncated or replaced - start over
+            self._rebuild_index()
+            return
+        self._scan_segment(self.chronicles_path, self._index, persist=True)
+
+    def _rebuild_index(self) -> None:
+        floor = ""
+        if self._sealed:
+            previous = self._load_sealed_index(self._sealed[-1])
+            floor = previous.max_timestamp if previous else ""
+        self._index = self._scan_segment(
+            self.chronicles_path,
+            _SegmentIndex(self.index_stride, floor)
+        )
+        self._write_index_file(self.index_path, self._index)
+
+    def _persist_checkpoint(self, checkpoint: Optional[Tuple[int, str]]) -> None:
+        if checkpoint is None:
+            return
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(list(checkpoint)) + "\n")
@@ -1,17 +1,85 @@
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from threading import Timer
+from threading import Condition, Thread
 import fnmatch
 import os
+import time
+import traceback
+
+
+class CoalescingMap:
+    """
+    Per-path debounce state: path -> deadline. Touching a path again pushes
+    its deadline back, so each file settles on its own and a burst across
+    many files (git checkout, a formatter run) yields one entry per file.
+
+    Not thread-safe; the owner serializes access (a lock, or one event loop).
+    """
+
+    def __init__(self, interval, batch_window=None):
+        self.interval = interval
+        # Paths due within this long of each other are released together
+        self.batch_window = interval / 4 if batch_window is None else batch_window
+        # Deadlines are now + interval, so insertion order is deadline order
+        self._deadlines = {}
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def touch(self, path, now=None):
+        """Record an event for `path`; returns True if it wasn't pending yet."""
+        now = time.monotonic() if now is None else now
+        is_new = self._deadlines.pop(path, None) is None
+        self._deadlines[path] = now + self.interval
+        return is_new
+
+    def next_deadline(self):
+        """When the earliest pending path settles (None if nothing is pending)."""
+        for deadline in self._deadlines.values():
+            return deadline
+        return None
+
+    def pop_due(self, now=None):
+        """Remove and return, in event order, every path due by now + batch_window."""
+        now = time.monotonic() if now is None else now
+        cutoff = now + self.batch_window
+        due = []
+        for path, deadline in self._deadlines.items():
+            if deadline > cutoff:
+                break
+            due.append(path)
+        for path in due:
+            del self._deadlines[path]
+        return due
+
+    def drain(self):
+        """Remove and return everything still pending."""
+        paths = list(self._deadlines)
+        self._deadlines.clear()
+        return paths
 
 
 class TheAllSeeingEye(FileSystemEventHandler):
-    def __init__(self, callback, debounce_interval=2.0, ignore_patterns=None):
+    """
+    Filters filesystem events and debounces them per path.
+
+    `callback(paths)` receives batches of settled paths from a single
+    scheduler thread. When the caller debounces itself (e.g. TheChoir), it
+    passes `on_path` instead, and `on_path(path)` is invoked for every
+    relevant event.
+    """
+
+    def __init__(self, callback=None, debounce_interval=2.0, ignore_patterns=None, on_path=None):
+        if (callback is None) == (on_path is None):
+            raise ValueError("pass exactly one of callback (debounced batches) or on_path (every event)")
         self.callback = callback
+        self.on_path = on_path
         self.debounce_interval = debounce_interval
         self.ignore_patterns = ignore_patterns or []
-        self.timer = None
-        self.last_event_path = None
+        self.pending = CoalescingMap(debounce_interval)
+        self._condition = Condition()
+        self._scheduler = None
+        self._running = False
 
     def _is_ignored(self, path):
         # Ignore directories and temp files
@@ -28,6 +96,9 @@ class TheAllSeeingEye(FileSystemEventHandler):
         if (
             "angel_chronicles" in filename
             or "angel_state" in filename
+            or "angel_layout" in filename
+            or "angel_brain_cache" in filename
+            or "angel_usage" in filename
             or filename == "angel_traceability.html"
         ):
             return True
@@ -39,13 +110,56 @@ class TheAllSeeingEye(FileSystemEventHandler):
         if self._is_ignored(file_path):
             return
 
-        # Cancel existing timer to reset the clock (debounce)
-        if self.timer:
-            self.timer.cancel()
+        if self.on_path is not None:
+            # Caller debounces (e.g. TheChoir)
+            self.on_path(file_path)
+            return
 
-        self.last_event_path = file_path
-        self.timer = Timer(self.debounce_interval, lambda: self.callback(self.last_event_path))
-        self.timer.start()
+        with self._condition:
+            if self.pending.touch(file_path):
+                self._condition.notify()
+
+    def start(self):
+        """Start the scheduler thread that releases settled paths."""
+        with self._condition:
+            if self._running or self.on_path is not None:
+                return
+            self._running = True
+        self._scheduler = Thread(target=self._schedule, name="angel-eye-debounce", daemon=True)
+        self._scheduler.start()
+
+    def stop(self, flush=False):
+        """Stop the scheduler; with `flush`, release everything still pending first."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._scheduler is not None:
+            self._scheduler.join()
+            self._scheduler = None
+        if flush:
+            with self._condition:
+                paths = self.pending.drain()
+            if paths:
+                self.callback(paths)
+
+    def _schedule(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    deadline = self.pending.next_deadline()
+                    now = time.monotonic()
+                    if deadline is not None and deadline <= now:
+                        break
+                    self._condition.wait(None if deadline is None else deadline - now)
+                if not self._running:
+                    return
+                paths = self.pending.pop_due()
+            if paths:
+                try:
+                    self.callback(paths)
+                except Exception:
+                    # Keep the scheduler alive for the next batch
+                    traceback.print_exc()
 
     def on_modified(self, event):
         self._trigger_debounce(event.src_path)
@@ -60,19 +174,22 @@ class TheAllSeeingEye(FileSystemEventHandler):
 
 
 class VisionSystem:
-    def __init__(self, path, callback, config):
+    def __init__(self, path, config, callback=None, on_path=None):
         self.observer = Observer()
         self.handler = TheAllSeeingEye(
             callback,
             config['vision']['debounce_seconds'],
-            config['vision']['ignore_patterns']
+            config['vision']['ignore_patterns'],
+            on_path=on_path
         )
         self.path = path
 
     def open_eyes(self):
+        self.handler.start()
         self.observer.schedule(self.handler, self.path, recursive=True)
         self.observer.start()
 
     def close_eyes(self):
         self.observer.stop()
         self.observer.join()
+        self.handler.stop()
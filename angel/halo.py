@@ -1,5 +1,46 @@
 import json
 import os
+import threading
+import time
+from datetime import date
+from typing import Optional, Tuple
+
+
+class TokenBucket:
+    """
+    A token-bucket rate limiter, safe to share between threads.
+
+    Refills continuously at `rate_per_minute` and holds at most `capacity`
+    (default: one minute's worth), so short bursts pass at once and a
+    sustained load is smoothed to the rate.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._available = threading.Condition()
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Take `amount` tokens, waiting for the refill; False if `timeout` runs out first."""
+        # A single request larger than the bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate_per_second
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self._available.wait(wait)
 
 
 class HaloSystem:
@@ -7,34 +48,96 @@ class HaloSystem:
         self.max_cost = config['halo']['max_daily_cost_usd']
         self.stop_file = config['halo']['emergency_stop_file']
         self.usage_file = config.get('halo', {}).get('usage_file', 'angel_usage.json')
+        # The budget is per calendar day: spend resets when the date changes
+        self.spend_date = date.today().isoformat()
         self.current_spend = self._load_spend()
 
+        # --- RATE LIMITS (null = unlimited) ---
+        halo_config = config.get('halo', {})
+        requests_per_minute = halo_config.get('requests_per_minute')
+        tokens_per_minute = halo_config.get('tokens_per_minute')
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.input_cost_per_mtok = halo_config.get('input_cost_per_mtok', 3.00)
+        self.output_cost_per_mtok = halo_config.get('output_cost_per_mtok', 15.00)
+        # Worst-case cost of requests admitted but not yet settled
+        self.reserved_spend = 0.0
+        self._lock = threading.Lock()
+
     def _load_spend(self) -> float:
         if not os.path.exists(self.usage_file):
             return 0.0
         try:
             with open(self.usage_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            if data.get("date") != self.spend_date:
+                return 0.0  # Another day's spend (or an undated file)
             value = float(data.get("current_spend", 0.0))
             return value if value >= 0 else 0.0
         except Exception:
             return 0.0
 
     def _save_spend(self) -> None:
-        data = {"current_spend": self.current_spend}
+        data = {"date": self.spend_date, "current_spend": self.current_spend}
         with open(self.usage_file, "w", encoding="utf-8") as f:
             json.dump(data, f)
 
+    def _roll_day(self) -> None:
+        """Start a fresh budget once the date changes. Call with the lock held."""
+        today = date.today().isoformat()
+        if today != self.spend_date:
+            self.spend_date = today
+            self.current_spend = 0.0
+
     def check_safety(self):
         """Returns (False, Reason) if safety is breached."""
         if os.path.exists(self.stop_file):
             return False, "Emergency Stop File Detected!"
 
-        if self.current_spend >= self.max_cost:
+        with self._lock:
+            self._roll_day()
+            depleted = self.current_spend >= self.max_cost
+        if depleted:
             return False, "Mana Pool Depleted (Budget Limit Reached)"
 
         return True, "Systems Normal"
 
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """USD for a request of this size."""
+        return (input_tokens * self.input_cost_per_mtok + output_tokens * self.output_cost_per_mtok) / 1_000_000
+
+    def admit(self, tokens: int, cost: float) -> Tuple[bool, str]:
+        """
+        Gate one API request before it is dispatched: safety first, then the
+        rate limits (waits for them), then the budget. An admitted request's
+        worst-case `cost` stays reserved until `settle()`, so concurrent
+        requests can't overshoot the budget together.
+        """
+        is_safe, msg = self.check_safety()
+        if not is_safe:
+            return False, msg
+
+        if self.request_bucket is not None:
+            self.request_bucket.acquire(1)
+        if self.token_bucket is not None:
+            self.token_bucket.acquire(tokens)
+
+        with self._lock:
+            self._roll_day()
+            if self.current_spend + self.reserved_spend + cost > self.max_cost:
+                return False, "Mana Pool Depleted (Budget Limit Reached)"
+            self.reserved_spend += cost
+        return True, "Systems Normal"
+
+    def settle(self, reserved_cost: float, input_tokens: int = 0, output_tokens: int = 0):
+        """Release an admitted request's reservation and record what it actually used."""
+        with self._lock:
+            self.reserved_spend = max(0.0, self.reserved_spend - reserved_cost)
+        if input_tokens or output_tokens:
+            self.record_spend(self.cost(input_tokens, output_tokens))
+
     def record_spend(self, cost):
-        self.current_spend += cost
-        self._save_spend()
+        with self._lock:
+            self._roll_day()
+            self.current_spend += cost
+            self._save_spend()
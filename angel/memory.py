@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+# Volatile diff lines: blob ids differ between git and the Mirror, and line
+# numbers shift whenever something above the hunk changes
+_INDEX_LINE = re.compile(r"^index [0-9a-f]+\.\.[0-9a-f]+.*$", re.M)
+_HUNK_RANGE = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@", re.M)
+
+
+class TheMemory:
+    """
+    The Memory. Remembers what the Brain concluded about diffs it has seen.
+
+    Entries are keyed by a hash of (provider, model, filename, normalized
+    diff) and hold only the conclusion - intent, edge type, confidence,
+    rationale - never the diff itself. Least recently used entries are
+    evicted past `max_entries`, and entries older than `ttl_seconds` are
+    treated as misses. The file is rewritten (atomically) after each new
+    entry, so an autosave loop or a revert costs a lookup instead of an
+    API call, across restarts too.
+    """
+
+    VERSION = 1
+    # What TheBrain reads back from every result
+    RESULT_KEYS = ("intent", "edge_type", "confidence", "rationale")
+
+    def __init__(self, path="angel_brain_cache.json", max_entries: int = 2048, ttl_seconds: Optional[float] = 30 * 86400):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # One writer at a time, newest state last
+
+        # --- METRICS ---
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+        self._load()
+
+    @staticmethod
+    def key(provider: str, model: str, filename: str, diff: Optional[str]) -> str:
+        digest = hashlib.sha256()
+        for part in (provider, model, filename, normalize_diff(diff)):
+            digest.update(part.encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def recall(self, key: str) -> Optional[dict]:
+        """The stored conclusion for `key`, or None (counted as a miss)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and now - entry["stored"] > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry["result"])
+
+    def remember(self, key: str, result: dict):
+        with self._lock:
+            self._entries[key] = {"stored": time.time(), "result": dict(result)}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        self.save()
+
+    def save(self):
+        """Persist the current recency order (hits only reorder in memory)."""
+        with self._write_lock:
+            with self._lock:
+                content = self._serialize()
+            self._write(content)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # A damaged cache is only a cold cache
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return
+        entries = data.get("entries")
+        if not isinstance(entries, list):
+            return
+        now = time.time()
+        for item in entries:
+            # Skip anything this version didn't write rather than fail on it
+            if not isinstance(item, (list, tuple)) or len(item) != 2:
+                continue
+            key, entry = item
+            if (
+                not isinstance(key, str)
+                or not isinstance(entry, dict)
+                or not isinstance(entry.get("stored"), (int, float))
+                or not isinstance(entry.get("result"), dict)
+                or not all(name in entry["result"] for name in self.RESULT_KEYS)
+            ):
+                continue
+            if self.ttl_seconds is not None and now - entry["stored"] > self.ttl_seconds:
+                continue
+            self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _serialize(self) -> str:
+        # Oldest first, so a reload restores the LRU order
+        return json.dumps({"version": self.VERSION, "entries": list(self._entries.items())})
+
+    def _write(self, content: str):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Caching is best effort; the analysis already succeeded
+
+
+def normalize_diff(diff: Optional[str]) -> str:
+    """The parts of a diff that matter to its analysis."""
+    if not diff:
+        return ""
+    text = diff.replace("\r\n", "\n")
+    text = _INDEX_LINE.sub("", text)
+    text = _HUNK_RANGE.sub("@@", text)
+    return "\n".join(line.rstrip() for line in text.split("\n") if line.strip())
@@ -0,0 +1,276 @@
+import atexit
+import difflib
+import hashlib
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Attributes that make git rewrite a file between the working tree and its blob
+_CONVERSION_ATTRIBUTES = ("text", "eol", "filter", "ident", "working-tree-encoding")
+
+
+class TheMirror:
+    """
+    The Mirror. Working-tree-vs-HEAD diffs without a process per file.
+
+    One long-lived `git cat-file --batch-check` and one `git cat-file
+    --batch` per repository answer "what is HEAD:<path>?"; the diff itself
+    is computed in-process with difflib. Results are cached by the pair of
+    blob hashes (HEAD blob, working-tree blob), so re-diffing an unchanged
+    file costs one cat-file round trip and a hash of the file.
+
+    The working-tree bytes are hashed and diffed as they are, so a path
+    git would convert on its way into the repository (core.autocrlf, or
+    text/eol/filter/ident/working-tree-encoding attributes, e.g. LFS) is
+    left to git: comparing it raw would show every line of a CRLF file as
+    rewritten.
+
+    Raises RuntimeError when a path is not inside a git repository with at
+    least one commit, or is converted by git (callers fall back to plain
+    `git diff`).
+    """
+
+    def __init__(self, context_lines: int = 3, cache_size: int = 512):
+        self.context_lines = context_lines
+        self.cache_size = cache_size
+        self._roots: Dict[str, Optional[str]] = {}    # directory -> repo root (None = not a repo)
+        self._repos: Dict[str, "_CatFile"] = {}
+        self._cache: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        atexit.register(self.close)
+
+    def diff(self, file_path: str) -> Optional[str]:
+        """Unified diff of `file_path` against HEAD; None if unchanged or untracked."""
+        file_path = os.path.abspath(file_path)
+        root = self._root_for(os.path.dirname(file_path))
+        if root is None:
+            raise RuntimeError(f"{file_path} is not inside a git repository")
+        relative = os.path.relpath(file_path, root).replace(os.sep, "/")
+
+        repo = self._repo(root)
+        head_sha = repo.object_id(f"HEAD:{relative}")
+        if head_sha is None:
+            if repo.object_id("HEAD") is None:
+                raise RuntimeError(f"{root} has no commits to diff against")
+            return None  # Untracked at HEAD - matches `git diff HEAD`
+        if repo.converts(relative):
+            raise RuntimeError(f"git converts {relative} on checkin; only git can diff it faithfully")
+
+        try:
+            with open(file_path, "rb") as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        current_sha = _blob_sha(current) if current is not None else "deleted"
+        if current_sha == head_sha:
+            return None
+
+        key = (head_sha, current_sha)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._header(relative, self._cache[key])
+            self.misses += 1
+
+        body = self._unified(repo.contents(head_sha), current)
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return self._header(relative, body)
+
+    def close(self):
+        with self._lock:
+            repos = list(self._repos.values())
+            self._repos.clear()
+        for repo in repos:
+            repo.close()
+
+    @staticmethod
+    def _header(relative: str, body: Optional[str]) -> Optional[str]:
+        # The body is path-independent so identical edits share a cache entry
+        if body is None:
+            return None
+        return f"diff --git a/{relative} b/{relative}\n--- a/{relative}\n+++ b/{relative}\n{body}"
+
+    def _unified(self, old: bytes, new: Optional[bytes]) -> Optional[str]:
+        if new is None:
+            new = b""
+        if b"\0" in old[:8000] or b"\0" in new[:8000]:
+            return "Binary files differ\n"
+        old_lines = old.decode("utf-8", errors="replace").splitlines(keepends=True)
+        new_lines = new.decode("utf-8", errors="replace").splitlines(keepends=True)
+        hunks = list(difflib.unified_diff(old_lines, new_lines, n=self.context_lines))[2:]
+        if not hunks:
+            return None
+        # difflib leaves a missing final newline unmarked; keep lines separate
+        return "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in hunks)
+
+    def _root_for(self, directory: str) -> Optional[str]:
+        with self._lock:
+            if directory in self._roots:
+                return self._roots[directory]
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"],
+                capture_output=True,
+                text=True,
+                cwd=directory or "."
+            )
+            root = os.path.abspath(result.stdout.strip()) if result.returncode == 0 else None
+        except (OSError, ValueError):
+            root = None
+        with self._lock:
+            self._roots[directory] = root
+        return root
+
+    def _repo(self, root: str) -> "_CatFile":
+        with self._lock:
+            repo = self._repos.get(root)
+            if repo is None:
+                repo = self._repos[root] = _CatFile(root)
+            return repo
+
+
+class _CatFile:
+    """
+    A pair of persistent `git cat-file` processes for one repository, and
+    a persistent `git check-attr` for whether git converts a path.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._check = None
+        self._batch = None
+        self._attr = None
+        self._autocrlf: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def object_id(self, name: str) -> Optional[str]:
+        """Blob/commit id for an object name like HEAD:path, or None if missing."""
+        with self._lock:
+            try:
+                self._check = self._check or self._spawn("--batch-check")
+                header = self._ask(self._check, name)
+            except (OSError, RuntimeError) as e:
+                self._check = self._reap(self._check)
+                raise RuntimeError(f"git cat-file failed: {e}") from e
+        return None if header.endswith(b" missing") else header.split(b" ", 1)[0].decode("ascii")
+
+    def contents(self, sha: str) -> bytes:
+        with self._lock:
+            try:
+                self._batch = self._batch or self._spawn("--batch")
+                header = self._ask(self._batch, sha)
+                size = int(header.rsplit(b" ", 1)[1])
+                data = self._batch.stdout.read(size + 1)  # Content plus trailing newline
+            except (OSError, RuntimeError, ValueError, IndexError) as e:
+                self._batch = self._reap(self._batch)
+                raise RuntimeError(f"git cat-file failed: {e}") from e
+        return data[:size]
+
+    def converts(self, relative: str) -> bool:
+        """Whether git transforms `relative` between the working tree and a blob."""
+        with self._lock:
+            try:
+                if self._autocrlf is None:
+                    self._autocrlf = self._config("core.autocrlf") in ("true", "input")
+                self._attr = self._attr or self._spawn_check_attr()
+                attributes = self._ask_attributes(self._attr, relative)
+            except (OSError, RuntimeError, ValueError) as e:
+                self._attr = self._reap(self._attr)
+                raise RuntimeError(f"git check-attr failed: {e}") from e
+        text = attributes.pop("text")
+        if text not in ("unspecified", "unset"):
+            return True  # text / text=auto normalize line endings
+        if any(value not in ("unspecified", "unset") for value in attributes.values()):
+            return True
+        return text == "unspecified" and self._autocrlf
+
+    def close(self):
+        with self._lock:
+            self._check = self._reap(self._check)
+            self._batch = self._reap(self._batch)
+            self._attr = self._reap(self._attr)
+
+    @staticmethod
+    def _reap(process: Optional[subprocess.Popen]) -> None:
+        """Shut a cat-file process down (a fresh one is spawned on next use)."""
+        if process is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return None
+
+    def _spawn(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.root
+        )
+
+    def _spawn_check_attr(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "check-attr", "--stdin", "-z", *_CONVERSION_ATTRIBUTES],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.root
+        )
+
+    def _config(self, name: str) -> Optional[str]:
+        result = subprocess.run(["git", "config", "--get", name], capture_output=True, text=True, cwd=self.root)
+        return result.stdout.strip().lower() if result.returncode == 0 else None
+
+    @staticmethod
+    def _ask_attributes(process: subprocess.Popen, path: str) -> Dict[str, str]:
+        """{attribute: value} for `path`; values are "set", "unset", "unspecified" or the value."""
+        if "\0" in path:
+            raise ValueError("paths cannot contain NUL")
+        process.stdin.write(path.encode("utf-8") + b"\0")
+        process.stdin.flush()
+        attributes = {}
+        # -z output: <path> NUL <attribute> NUL <value> NUL, once per attribute asked
+        for _ in _CONVERSION_ATTRIBUTES:
+            _, name, value = (_read_field(process) for field in range(3))
+            attributes[name] = value
+        return attributes
+
+    @staticmethod
+    def _ask(process: subprocess.Popen, name: str) -> bytes:
+        if "\n" in name:
+            raise ValueError("object names cannot contain newlines")
+        process.stdin.write(name.encode("utf-8") + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        return header.rstrip(b"\n")
+
+
+def _read_field(process: subprocess.Popen) -> str:
+    field = bytearray()
+    while True:
+        byte = process.stdout.read(1)
+        if not byte:
+            raise RuntimeError("git check-attr exited unexpectedly")
+        if byte == b"\0":
+            return field.decode("utf-8", errors="replace")
+        field += byte
+
+
+def _blob_sha(data: bytes) -> str:
+    """The id git would give `data` as a blob."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
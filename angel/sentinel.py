@@ -0,0 +1,233 @@
+import hashlib
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+# Plugins and filters for pool workers, built once per process by _init_worker
+_WORKER_PLUGINS: Optional[list] = None
+_WORKER_FILTERS: Optional[list] = None
+# is_invalid_file skips names that aren't files on disk; the Sentinel scans diff text
+_SKIPPED_FILTERS = frozenset(("detect_secrets.filters.common.is_invalid_file",))
+
+
+def load_plugins() -> list:
+    """The detect-secrets detectors the Angel checks for (ImportError if unavailable)."""
+    from detect_secrets.plugins.aws import AWSKeyDetector
+    from detect_secrets.plugins.high_entropy_strings import Base64HighEntropyString, HexHighEntropyString
+    from detect_secrets.plugins.keyword import KeywordDetector
+    from detect_secrets.plugins.private_key import PrivateKeyDetector
+
+    return [
+        AWSKeyDetector(),
+        PrivateKeyDetector(),
+        KeywordDetector(),
+        Base64HighEntropyString(),
+        HexHighEntropyString(),
+    ]
+
+
+def load_filters() -> list:
+    """
+    detect-secrets' default filters - allowlist pragmas and the heuristics
+    for UUIDs, templated values, lockfiles and the like - as its own scans
+    apply them (ImportError if unavailable).
+    """
+    from detect_secrets.settings import get_filters
+
+    return [filter_fn for filter_fn in get_filters() if filter_fn.path not in _SKIPPED_FILTERS]
+
+
+class TheSentinel:
+    """
+    The Sentinel. Decides whether a diff may carry a secret before it leaves
+    the machine.
+
+    The detect-secrets plugins are built once and reused, and findings go
+    through detect-secrets' default filters, so its usual false positives
+    (UUIDs, templated values, pragma-allowlisted lines) don't block a
+    diff. Only added lines are scanned (as detect-secrets' own diff scan
+    does), one hunk at a time, and each hunk's verdict is cached by a hash
+    of the file name and its added lines -
+    re-saving a file only scans the hunks that actually changed. Diffs
+    with more than `pool_threshold` uncached added lines go to a process
+    pool when `processes` > 0.
+
+    Fails closed: if the plugins can't be loaded or a scan errors, the
+    diff is treated as containing a secret.
+    """
+
+    def __init__(self, cache_size: int = 4096, processes: int = 0, pool_threshold: int = 2000):
+        self.cache_size = cache_size
+        self.processes = processes
+        self.pool_threshold = pool_threshold
+        self._verdicts: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        try:
+            self._plugins = load_plugins()
+            self._filters = load_filters()
+        except Exception:
+            self._plugins = None
+            self._filters = None
+
+        # --- METRICS ---
+        self.scans = 0
+        self.hunks_scanned = 0
+        self.hunk_cache_hits = 0
+        self.lines_scanned = 0
+        self.pooled_scans = 0
+        self.flagged = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self._plugins is not None
+
+    def contains_secrets(self, diff: str, filename: str = "diff") -> bool:
+        started = time.perf_counter()
+        try:
+            found = self._check(diff, filename)
+        except Exception:
+            found = True
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.scans += 1
+            self.flagged += found
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+        return found
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "scans": self.scans,
+                "flagged": self.flagged,
+                "hunks_scanned": self.hunks_scanned,
+                "hunk_cache_hits": self.hunk_cache_hits,
+                "lines_scanned": self.lines_scanned,
+                "pooled_scans": self.pooled_scans,
+                "avg_ms": self.total_seconds / self.scans * 1000 if self.scans else 0.0,
+                "max_ms": self.max_seconds * 1000
+            }
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _check(self, diff: str, filename: str) -> bool:
+        if self._plugins is None:
+            return True
+
+        # Keyword patterns and the file filters depend on the file name, so it is part of the key
+        pending = []
+        for hunk in _added_lines(diff):
+            key = hashlib.sha256("\n".join([filename, *hunk]).encode("utf-8", errors="replace")).hexdigest()
+            with self._lock:
+                verdict = self._verdicts.get(key)
+                if verdict is not None:
+                    self._verdicts.move_to_end(key)
+                    self.hunk_cache_hits += 1
+            if verdict:
+                return True
+            if verdict is None:
+                pending.append((key, hunk))
+        if not pending:
+            return False
+
+        hunks = [hunk for _, hunk in pending]
+        lines = sum(len(hunk) for hunk in hunks)
+        if self.processes > 0 and lines > self.pool_threshold:
+            verdicts = self._scan_pooled(filename, hunks)
+        else:
+            verdicts = _scan_hunks(self._plugins, self._filters, filename, hunks)
+
+        with self._lock:
+            self.hunks_scanned += len(hunks)
+            self.lines_scanned += lines
+            for (key, _), verdict in zip(pending, verdicts):
+                self._verdicts[key] = verdict
+            while len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return any(verdicts)
+
+    def _scan_pooled(self, filename: str, hunks: List[List[str]]) -> List[bool]:
+        with self._lock:
+            if self._pool is None:
+                # Spawn, not fork: forking copies the Angel's threads' locks mid-use
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    initializer=_init_worker,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            pool = self._pool
+            self.pooled_scans += 1
+        # About one contiguous slice of hunks per worker
+        size = -(-len(hunks) // self.processes)
+        slices = [hunks[i:i + size] for i in range(0, len(hunks), size)]
+        verdicts: List[bool] = []
+        for part in pool.map(_scan_in_worker, [filename] * len(slices), slices):
+            verdicts.extend(part)
+        return verdicts
+
+
+def _added_lines(diff: str) -> List[List[str]]:
+    """The added lines of each hunk; text that isn't a diff counts as one all-added hunk."""
+    lines = diff.splitlines()
+    if not any(line.startswith("@@") for line in lines):
+        return [lines] if lines else []
+    hunks: List[List[str]] = []
+    for line in lines:
+        if line.startswith("@@"):
+            hunks.append([])
+        elif hunks and line.startswith("+"):
+            hunks[-1].append(line[1:])
+    return [hunk for hunk in hunks if hunk]
+
+
+def _scan_hunks(plugins: list, filters: list, filename: str, hunks: List[List[str]]) -> List[bool]:
+    """Whether each hunk has a finding that survives the filters, in detect-secrets' order."""
+    from detect_secrets.util.code_snippet import get_code_snippet
+    from detect_secrets.util.inject import call_function_with_arguments
+
+    def filtered(stage: list, **kwargs) -> bool:
+        return any(call_function_with_arguments(filter_fn, **kwargs) for filter_fn in stage)
+
+    file_filters = [f for f in filters if f.injectable_variables <= {"filename"}]
+    line_filters = [f for f in filters if f not in file_filters and "secret" not in f.injectable_variables]
+    secret_filters = [f for f in filters if "secret" in f.injectable_variables]
+    if filtered(file_filters, filename=filename):
+        return [False] * len(hunks)
+
+    verdicts = []
+    for hunk in hunks:
+        found = False
+        for line_number, line in enumerate(hunk, 1):
+            context = get_code_snippet(hunk, line_number)
+            if filtered(line_filters, filename=filename, line=line, context=context):
+                continue
+            found = any(
+                not filtered(secret_filters, filename=filename, line=line, context=context,
+                             secret=secret.secret_value, plugin=plugin)
+                for plugin in plugins
+                for secret in plugin.analyze_line(filename=filename, line=line, line_number=line_number, context=context)
+            )
+            if found:
+                break
+        verdicts.append(found)
+    return verdicts
+
+
+def _init_worker():
+    global _WORKER_PLUGINS, _WORKER_FILTERS
+    _WORKER_PLUGINS = load_plugins()
+    _WORKER_FILTERS = load_filters()
+
+
+def _scan_in_worker(filename: str, hunks: List[List[str]]) -> List[bool]:
+    return _scan_hunks(_WORKER_PLUGINS, _WORKER_FILTERS, filename, hunks)
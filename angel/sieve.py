@@ -0,0 +1,157 @@
+import fnmatch
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# Files whose diffs say nothing about intent beyond "this was regenerated"
+GENERATED_PATTERNS = (
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+    "poetry.lock", "Pipfile.lock", "uv.lock", "Cargo.lock", "go.sum",
+    "composer.lock", "Gemfile.lock", "*.min.js", "*.min.css", "*.map",
+    "*.pb.go", "*_pb2.py", "*.snap",
+)
+# Markers that tools put near the top of files they generate
+_GENERATED_MARKERS = ("@generated", "do not edit", "auto-generated", "autogenerated")
+# Room reserved for each "[... N more ...]" line
+_MARKER_CHARS = 40
+_HUNK_START = re.compile(r"^@@ -\d+(?:,\d+)? \+[01][, ]")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return len(text) // 4 + 1 if text else 0
+
+
+class TheSieve:
+    """
+    The Sieve. Fits a diff into a token budget before it is scanned and sent.
+
+    In order, until the diff fits:
+      1. binary and generated files (lockfiles, minified bundles, files
+         marked @generated) keep their headers, contents are omitted
+      2. overlong lines (minified code, data blobs) are clipped
+      3. unchanged context lines are dropped
+      4. each hunk keeps its header and first changed line plus an even
+         share of the remaining budget; hunks that don't fit even that
+         are counted but omitted
+    A `max_tokens` of 0 or less sends every diff untouched. Returns the
+    diff to send and a note on what was left out (None when nothing was),
+    for the Proposal's diff_summary.
+    """
+
+    def __init__(self, max_tokens: int = 2000, generated_patterns: Sequence[str] = GENERATED_PATTERNS, max_line_chars: int = 240):
+        self.max_tokens = max_tokens
+        self.generated_patterns = tuple(generated_patterns)
+        self.max_line_chars = max_line_chars
+
+    def sift(self, filename: str, diff: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        # No budget means send everything, generated and binary files included
+        if not diff or self.max_tokens <= 0:
+            return diff, None
+        header, hunks = _parse(diff)
+        changed = sum(_count_changes(body) for _, body in hunks)
+
+        if any(line.startswith(("Binary files ", "GIT binary patch")) for line in header):
+            return "".join(header), "binary contents omitted"
+        if self._is_generated(filename, hunks):
+            added = sum(1 for _, body in hunks for line in body if line.startswith("+"))
+            removed = sum(1 for _, body in hunks for line in body if line.startswith("-"))
+            summary = f"[generated file: +{added}/-{removed} lines, contents omitted]\n"
+            return "".join(header) + summary, "generated file, contents omitted"
+        if estimate_tokens(diff) <= self.max_tokens:
+            return diff, None
+
+        notes = []
+        if any(len(line) > self.max_line_chars + 1 for _, body in hunks for line in body):
+            notes.append("long lines clipped")
+            hunks = [(hunk_header, [self._clip(line) for line in body]) for hunk_header, body in hunks]
+            text = _join(header, hunks)
+            if estimate_tokens(text) <= self.max_tokens:
+                return text, "; ".join(notes)
+
+        hunks = [(hunk_header, [line for line in body if not line.startswith(" ")]) for hunk_header, body in hunks]
+        notes.append("context lines omitted")
+        text = _join(header, hunks)
+        if estimate_tokens(text) <= self.max_tokens:
+            return text, "; ".join(notes)
+
+        # Every kept hunk reserves its header and first changed line, then
+        # gets an even share of what's left. The last character is held
+        # back so estimate_tokens() of the result stays within max_tokens.
+        budget = self.max_tokens * 4 - 1 - sum(len(line) for line in header) - _MARKER_CHARS
+        kept_hunks: List[Tuple[str, List[str]]] = []
+        reserved: List[int] = []
+        for hunk_header, body in hunks:
+            first_line = len(body[0]) if body else 0
+            cost = len(hunk_header) + _MARKER_CHARS + first_line
+            if budget - cost < 0:
+                break
+            budget -= cost
+            kept_hunks.append((hunk_header, body))
+            reserved.append(first_line)
+        share = budget // max(1, len(kept_hunks))
+
+        sent = 0
+        out = list(header)
+        for (hunk_header, body), first_line in zip(kept_hunks, reserved):
+            # Sample from both ends, so a hunk's first and last changes both survive
+            allowance = first_line + share
+            start, end, used = 0, len(body), 0
+            while start < end:
+                line = body[start] if start <= len(body) - end else body[end - 1]
+                if used + len(line) > allowance:
+                    break
+                used += len(line)
+                if start <= len(body) - end:
+                    start += 1
+                else:
+                    end -= 1
+            out.append(hunk_header)
+            out.extend(body[:start])
+            if start < end:
+                out.append(f"[... {_count_changes(body[start:end])} more changed lines]\n")
+            out.extend(body[end:])
+            sent += _count_changes(body[:start]) + _count_changes(body[end:])
+        if len(kept_hunks) < len(hunks):
+            omitted = len(hunks) - len(kept_hunks)
+            out.append(f"[... {omitted} more hunks]\n")
+            notes.append(f"{omitted} of {len(hunks)} hunks omitted")
+        notes.append(f"sent {sent} of {changed} changed lines")
+        return "".join(out), "; ".join(notes)
+
+    def _is_generated(self, filename: str, hunks: List[Tuple[str, List[str]]]) -> bool:
+        if any(fnmatch.fnmatch(filename, pattern) for pattern in self.generated_patterns):
+            return True
+        # Markers live in the first lines of the file: only a hunk starting there can show them
+        if hunks and _HUNK_START.match(hunks[0][0]):
+            head = "".join(hunks[0][1][:20]).lower()
+            return any(marker in head for marker in _GENERATED_MARKERS)
+        return False
+
+    def _clip(self, line: str) -> str:
+        if len(line) <= self.max_line_chars + 1:
+            return line
+        return line[:self.max_line_chars] + " [...]\n"
+
+
+def _parse(diff: str) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+    """Split a one-file diff into its header lines and (hunk header, body lines) pairs."""
+    header: List[str] = []
+    hunks: List[Tuple[str, List[str]]] = []
+    for line in diff.splitlines(keepends=True):
+        if not line.endswith("\n"):
+            line += "\n"
+        if line.startswith("@@"):
+            hunks.append((line, []))
+        elif hunks:
+            hunks[-1][1].append(line)
+        else:
+            header.append(line)
+    return header, hunks
+
+
+def _join(header: List[str], hunks: List[Tuple[str, List[str]]]) -> str:
+    return "".join(header) + "".join(hunk_header + "".join(body) for hunk_header, body in hunks)
+
+
+def _count_changes(lines: List[str]) -> int:
+    return sum(1 for line in lines if line.startswith(("+", "-")))
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .types import AngelEvent
+
+# Dictionary-encoded string columns (int32 codes, -1 = missing)
+DICTIONARY_COLUMNS = ("action_type", "actor", "file_path", "intent", "edge_type")
+
+# Rows written per part file
+PART_ROWS = 100_000
+# Trailing parts smaller than PART_ROWS (small incremental exports) merged into one past this many
+COMPACT_PARTS = 16
+
+
+class Tablet:
+    """
+    A columnar view of the Chronicles, ready for vectorized aggregation.
+
+    `columns` holds one NumPy array per field:
+      - timestamp:          datetime64[us]
+      - action_type, actor, file_path, intent, edge_type: int32 codes (-1 = missing)
+      - explicit_approval:  int8 (-1 = missing, 0 = no, 1 = yes)
+    `dictionaries` maps each coded column to the strings its codes point at.
+
+    Example - confirmations per file:
+        confirmed = tablet.columns["action_type"] == tablet.code("action_type", "PROPOSAL_CONFIRMED")
+        per_file = np.bincount(tablet.columns["file_path"][confirmed], minlength=len(tablet.dictionaries["file_path"]))
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def code(self, column: str, value: str) -> int:
+        """Code for `value` in a dictionary column, or -1 if it never occurs."""
+        matches = np.flatnonzero(self.dictionaries[column] == value)
+        return int(matches[0]) if len(matches) else -1
+
+    def decode(self, column: str) -> np.ndarray:
+        """Materialize a dictionary column back into strings (None where missing)."""
+        codes = self.columns[column]
+        lookup = np.append(self.dictionaries[column].astype(object), None)
+        return lookup[codes]
+
+
+class TheTablets:
+    """
+    The Stone Tablets. A compact columnar copy of the Chronicles for analytics.
+
+    Layout (one directory):
+      - manifest.json        last exported position, row counts, shared dictionaries
+      - part-000001.npz ...  column arrays, appended incrementally
+
+    Dictionaries are append-only and shared by every part, so reading is a
+    plain concatenation - no per-part code remapping. Frequent small
+    exports (a polling dashboard) are compacted: once COMPACT_PARTS
+    undersized parts pile up at the end, they are merged into one.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / "manifest.json"
+        self.manifest = self._load_manifest()
+
+    @property
+    def position(self) -> Optional[Tuple[int, int]]:
+        position = self.manifest.get("position")
+        return tuple(position) if position else None
+
+    def export(self, scribe) -> int:
+        """Append events recorded after the last exported position. Returns rows written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        dictionaries = {
+            column: {value: code for code, value in enumerate(self.manifest["dictionaries"][column])}
+            for column in DICTIONARY_COLUMNS
+        }
+
+        exported = 0
+        batch: List[AngelEvent] = []
+        position = self.position
+        for position, event in scribe.iter_records(start=position):
+            batch.append(event)
+            if len(batch) >= PART_ROWS:
+                exported += self._write_part(batch, dictionaries, position)
+                batch = []
+        if batch:
+            exported += self._write_part(batch, dictionaries, position)
+        return exported
+
+    def read(self) -> Tablet:
+        """Load every part into one Tablet."""
+        dictionaries = {
+            column: np.array(values, dtype=str)
+            for column, values in self.manifest["dictionaries"].items()
+        }
+        parts = [self._load_part(name) for name in self.manifest["parts"]]
+        columns = {}
+        for name, dtype in _COLUMN_DTYPES.items():
+            arrays = [part[name] for part in parts]
+            columns[name] = np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+        return Tablet(columns, dictionaries)
+
+    def _load_part(self, name: str) -> Dict[str, np.ndarray]:
+        # Copy the arrays out so each part's file is closed before the next opens
+        with np.load(self.directory / name) as part:
+            return {column: part[column] for column in _COLUMN_DTYPES}
+
+    def _write_part(self, events: List[AngelEvent], dictionaries: Dict[str, Dict[str, int]], position) -> int:
+        def encode(column: str, values: Iterable[Optional[str]]) -> np.ndarray:
+            lookup = dictionaries[column]
+            codes = []
+            for value in values:
+                if value is None:
+                    codes.append(-1)
+                    continue
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                    self.manifest["dictionaries"][column].append(value)
+                codes.append(code)
+            return np.array(codes, dtype=np.int32)
+
+        columns = {
+            "timestamp": _parse_timestamps([event.timestamp for event in events]),
+            "action_type": encode("action_type", (event.action_type for event in events)),
+            "actor": encode("actor", (event.actor for event in events)),
+            "file_path": encode("file_path", (event.file_path for event in events)),
+            "intent": encode("intent", (
+                event.edge.target if event.edge else event.intent_label for event in events
+            )),
+            "edge_type": encode("edge_type", (
+                event.edge.edge_type if event.edge else None for event in events
+            )),
+            "explicit_approval": np.array(
+                [-1 if event.explicit_approval is None else int(event.explicit_approval) for event in events],
+                dtype=np.int8
+            ),
+        }
+
+        parts = self.manifest["parts"]
+        part_rows = self.manifest["part_rows"]
+        # Undersized parts at the end, which this write could be merged with
+        small = 0
+        while small < len(parts) and part_rows[-1 - small] < PART_ROWS:
+            small += 1
+        merged = parts[-small:] if small >= COMPACT_PARTS else []
+        if merged:
+            loaded = [self._load_part(name) for name in merged]
+            columns = {
+                column: np.concatenate([part[column] for part in loaded] + [columns[column]])
+                for column in _COLUMN_DTYPES
+            }
+
+        name = self._next_part_name()
+        tmp_path = self.directory / (name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, self.directory / name)
+
+        # The manifest is the commit point: a part it doesn't list is never read
+        if merged:
+            del parts[-len(merged):]
+            del part_rows[-len(merged):]
+        parts.append(name)
+        part_rows.append(len(columns["timestamp"]))
+        self.manifest["rows"] += len(events)
+        self.manifest["position"] = list(position)
+        self._write_manifest()
+        for old in merged:
+            (self.directory / old).unlink(missing_ok=True)
+        return len(events)
+
+    def _next_part_name(self) -> str:
+        # Parts are renumbered upward only, so a merged part never reuses a listed name
+        number = self.manifest.get("next_part")
+        if number is None:
+            number = max((int(name[5:11]) for name in self.manifest["parts"]), default=0) + 1
+        self.manifest["next_part"] = number + 1
+        return f"part-{number:06d}.npz"
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if "part_rows" not in manifest:
+                # Written before per-part row counts were kept
+                manifest["part_rows"] = [len(self._load_part(name)["timestamp"]) for name in manifest["parts"]]
+            return manifest
+        return {
+            "position": None,
+            "rows": 0,
+            "parts": [],
+            "part_rows": [],
+            "next_part": 1,
+            "dictionaries": {column: [] for column in DICTIONARY_COLUMNS}
+        }
+
+    def _write_manifest(self) -> None:
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+_COLUMN_DTYPES = {
+    "timestamp": "datetime64[us]",
+    "action_type": np.int32,
+    "actor": np.int32,
+    "file_path": np.int32,
+    "intent": np.int32,
+    "edge_type": np.int32,
+    "explicit_approval": np.int8,
+}
+
+
+def _parse_timestamps(timestamps: List[str]) -> np.ndarray:
+    try:
+        # NumPy parses naive ISO-8601 strings in C
+        return np.array(timestamps, dtype="datetime64[us]")
+    except ValueError:
+        parsed = []
+        for timestamp in timestamps:
+            try:
+                moment = datetime.fromisoformat(timestamp)
+                parsed.append(np.datetime64(moment.replace(tzinfo=None), "us"))
+            except ValueError:
+                parsed.append(np.datetime64("NaT"))
+        return np.array(parsed, dtype="datetime64[us]")
+
+
+def read_columnar(directory) -> Tablet:
+    """Load a columnar export written by `TheScribe.export_columnar()`."""
+    return TheTablets(directory).read()
+
+
+def main(argv: Optional[List[str]] = None):
+    from .chronicles import TheScribe
+
+    parser = argparse.ArgumentParser(
+        prog="python -m angel.tablets",
+        description="Export the Chronicles to a compact columnar store."
+    )
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--chronicles", default="angel_chronicles.jsonl", help="Path to the active chronicle")
+    parser.add_argument("--out", default=None, help="Output directory (default: angel_chronicles.columnar)")
+    args = parser.parse_args(argv)
+
+    scribe = TheScribe(args.chronicles)
+    exported = scribe.export_columnar(args.out)
+    print(f"Exported {exported} new events.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+import argparse
+import asyncio
+import json
+import threading
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .chronicles import Position, TheScribe
+from .types import AngelEvent
+from .wheels import GRAPH_EVENTS, Sephirot
+
+# Records pulled from the log per read (bounds memory while catching up)
+READ_CHUNK = 512
+
+
+class _Client:
+    """One connected stream: a bounded queue drained by its own writer task."""
+
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int):
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class TheTrumpet:
+    """
+    The Trumpet. Streams the Chronicles to local clients as Server-Sent Events.
+
+    GET /events (alias /ws/events):
+      - one `angel` message per recorded AngelEvent (SSE id = event_id)
+      - after each confirmation, a `graph` message with the nodes/edges it
+        changed, in the same shape as the page's delta file
+    Resume with the Last-Event-ID header (EventSource sends it on
+    reconnect) or ?since=<event_id>; otherwise the stream starts at the
+    live tail. GET /health returns the counters as JSON.
+
+    One tail task polls the Scribe and fans out to per-client bounded
+    queues. When a client's queue is full the tail waits up to
+    `drain_timeout` for its writer to make room; a client whose queue
+    stays full is disconnected instead of buffered without limit. It
+    reconnects with Last-Event-ID and catches up from the log, so
+    slowness costs it latency, never events.
+    """
+
+    def __init__(
+        self,
+        scribe: TheScribe,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        poll_interval: float = 0.25,
+        client_queue: int = 256,
+        heartbeat: float = 15.0,
+        replay_buffer: int = 1024,
+        drain_timeout: float = 1.0
+    ):
+        self.scribe = scribe
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.client_queue = max(1, client_queue)
+        self.heartbeat = heartbeat
+        self.drain_timeout = drain_timeout
+        # Streaming keeps its own graph so deltas never race the renderer
+        self.graph = Sephirot(lod_threshold=0)
+
+        self._position: Optional[Position] = None
+        self._recent: Deque[Tuple[str, Position]] = deque(maxlen=replay_buffer)
+        self._clients: Set[_Client] = set()
+        self._handlers: Set[asyncio.Task] = set()  # One per open connection, cancelled on shutdown
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+        # --- METRICS ---
+        self.connections = 0
+        self.dropped = 0
+        self.resumed = 0
+        self.sent = 0
+
+    # --- LIFECYCLE ---
+
+    async def serve(self):
+        """Run until `stop()` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        await asyncio.to_thread(self._build_graph)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        tail = asyncio.create_task(self._tail())
+        self._ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            tail.cancel()
+            self._server.close()
+            for client in list(self._clients):
+                client.dropped = True
+                client.writer.transport.abort()
+            self._clients.clear()
+            # Finish every connection here, before asyncio.run() closes the loop under them
+            handlers = [tail, *self._handlers]
+            for handler in handlers:
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def start(self):
+        """Serve from a background thread (returns once the port is bound)."""
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self.serve(),), name="angel-trumpet", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout: Optional[float] = None):
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "connections": self.connections,
+            "resumed": self.resumed,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "position": list(self._position) if self._position else None
+        }
+
+    # --- THE TAIL ---
+
+    def _build_graph(self):
+        """Current graph (snapshot + newer events) and the position it covers."""
+        end = self.scribe.end_position()
+        loaded = self.scribe.load_snapshot()
+        start = None
+        if loaded is not None:
+            state, start = loaded
+            self.graph.load_snapshot(state)
+        for position, event in self.scribe.iter_records(start=start, action_types=GRAPH_EVENTS):
+            if position > end:
+                break
+            self.graph.replay([event])
+        self.graph.drain_changes()
+        self._position = end
+
+    def _read(self, start: Optional[Position], end: Optional[Position] = None) -> List[Tuple[Position, AngelEvent]]:
+        """Up to READ_CHUNK records after `start` (and not past `end`)."""
+        self.scribe.refresh()
+        records = []
+        for position, event in islice(self.scribe.iter_records(start=start), READ_CHUNK):
+            if end is not None and position > end:
+                break
+            records.append((position, event))
+        return records
+
+    async def _tail(self):
+        while True:
+            records = await asyncio.to_thread(self._read, self._position)
+            for position, event in records:
+                self._position = position
+                self._recent.append((event.event_id, position))
+                payload = _format(event)
+                if event.action_type in GRAPH_EVENTS and event.edge:
+                    self.graph.replay([event])
+                    payload += _format_graph(self.graph.drain_changes())
+                await self._broadcast(payload)
+            if len(records) < READ_CHUNK:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _broadcast(self, payload: bytes):
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # A burst (one batch commit) can outrun any queue: give the
+                # writer a chance to drain before deciding the client is slow
+                try:
+                    await asyncio.wait_for(client.queue.put(payload), self.drain_timeout)
+                except asyncio.TimeoutError:
+                    # Backpressure: the client can't keep up, let it resume later
+                    self._drop(client)
+
+    def _drop(self, client: _Client):
+        if client in self._clients:
+            self._clients.discard(client)
+            client.dropped = True
+            self.dropped += 1
+            client.writer.transport.abort()
+
+    # --- HTTP ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            await self._serve_connection(reader, writer)
+        except asyncio.CancelledError:
+            # Shutdown. Ending normally keeps start_server's done-callback from
+            # logging the cancellation as an error
+            pass
+        finally:
+            self._handlers.discard(task)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        lines = head.decode("latin-1").split("\r\n")
+        method, _, rest = lines[0].partition(" ")
+        target = rest.partition(" ")[0]
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        try:
+            if method != "GET":
+                await _respond(writer, "405 Method Not Allowed", b"")
+            elif url.path == "/health":
+                await _respond(writer, "200 OK", json.dumps(self.metrics()).encode("utf-8"), "application/json")
+            elif url.path in ("/events", "/ws/events"):
+                since = headers.get("last-event-id") or parse_qs(url.query).get("since", [None])[0]
+                await self._stream(reader, writer, since)
+            else:
+                await _respond(writer, "404 Not Found", b"")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, since: Optional[str]):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-store\r\n"
+            b"Connection: keep-alive\r\n"
+            b"Access-Control-Allow-Origin: *\r\n\r\n"
+        )
+        await writer.drain()
+        self.connections += 1
+
+        # Join the broadcast and note the tail in one step: everything after
+        # this position arrives through the queue, everything up to it from the log
+        client = _Client(writer, self.client_queue)
+        self._clients.add(client)
+        caught_up = self._position
+
+        if since:
+            start = await self._resume_position(since)
+            if start is None:
+                writer.write(b": unknown event id, streaming from the live tail\n\n")
+            else:
+                self.resumed += 1
+                await self._replay_backlog(client, start, caught_up)
+
+        # Clients never send anything after the request; EOF means they left
+        hangup = asyncio.ensure_future(reader.read(1))
+        try:
+            while not client.dropped:
+                message = asyncio.ensure_future(client.queue.get())
+                done, _ = await asyncio.wait({message, hangup}, timeout=self.heartbeat,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if message in done:
+                    writer.write(message.result())
+                    self.sent += 1
+                else:
+                    message.cancel()
+                    if hangup in done:
+                        break
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+        finally:
+            hangup.cancel()
+            self._clients.discard(client)
+
+    async def _resume_position(self, event_id: str) -> Optional[Position]:
+        for recent_id, position in reversed(self._recent):
+            if recent_id == event_id:
+                return position
+        return await asyncio.to_thread(self.scribe.position_after, event_id)
+
+    async def _replay_backlog(self, client: _Client, start: Position, end: Optional[Position]):
+        """Send what the client missed, straight from the log."""
+        if end is None:
+            return
+        while start < end and not client.dropped:
+            records = await asyncio.to_thread(self._read, start, end)
+            if not records:
+                return
+            touched = []
+            for position, event in records:
+                client.writer.write(_format(event))
+                if event.action_type in GRAPH_EVENTS and event.edge:
+                    touched.append((event.edge.source, event.edge.target))
+                start = position
+            if touched:
+                # Current state of what changed - the live tail carries on from here
+                client.writer.write(_format_graph(self.graph.describe_edges(touched)))
+            await client.writer.drain()
+
+
+def _format(event: AngelEvent) -> bytes:
+    return f"id: {event.event_id}\nevent: angel\ndata: {event.model_dump_json()}\n\n".encode("utf-8")
+
+
+def _format_graph(delta: dict) -> bytes:
+    return f"event: graph\ndata: {json.dumps(delta)}\n\n".encode("utf-8")
+
+
+async def _respond(writer: asyncio.StreamWriter, status: str, body: bytes, content_type: str = "text/plain"):
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m angel.trumpet",
+        description="Stream the Chronicles to local clients as Server-Sent Events."
+    )
+    parser.add_argument("--chronicles", default="angel_chronicles.jsonl", help="Path to the active chronicle")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    trumpet = TheTrumpet(TheScribe(args.chronicles), host=args.host, port=args.port)
+    print(f"Streaming on http://{args.host}:{args.port}/events")
+    try:
+        asyncio.run(trumpet.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
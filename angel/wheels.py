@@ -1,17 +1,160 @@
 import html
+import json
+import math
+import os
+import re
+import threading
+import time
+import traceback
+from bisect import bisect_right
 import networkx as nx
+import numpy as np
+from array import array
+from pathlib import Path
 from pyvis.network import Network
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 from .types import AngelEvent, EdgeDef
 
+# Polls the delta file and folds changed nodes/edges into the live page.
+# fetch() needs the page to be served over http (file:// blocks it); a full
+# render with a new base makes open pages reload.
+_DELTA_SCRIPT = """
+<script type="text/javascript">
+(function () {
+  var base = %(base)s;
+  var seq = 0;
+  function poll() {
+    fetch(%(delta_url)s + "?t=" + Date.now(), {cache: "no-store"})
+      .then(function (response) { return response.json(); })
+      .then(function (delta) {
+        if (delta.base !== base) { window.location.reload(); return; }
+        if (delta.seq <= seq) { return; }
+        seq = delta.seq;
+        nodes.update(delta.nodes);
+        edges.update(delta.edges);
+      })
+      .catch(function () {});
+  }
+  setInterval(poll, %(poll_ms)d);
+})();
+</script>
+"""
+
+
+# Interned codes for the array-backed store
+NODE_TYPES = ("file", "intent")
+EDGE_TYPES = ("implements", "modifies", "deprecates", "relates_to")
+
+# The only events that change the graph
+GRAPH_EVENTS = frozenset(("PROPOSAL_CONFIRMED",))
+
+# Words that say nothing about what an intent is about; skipped when grouping
+_INTENT_STOPWORDS = frozenset((
+    "a", "an", "the", "and", "or", "of", "to", "for", "in", "on", "with", "from", "by",
+    "add", "added", "adds", "update", "updated", "updates", "fix", "fixed", "fixes",
+    "refactor", "refactored", "remove", "removed", "implement", "implemented",
+    "improve", "improved", "change", "changed", "new", "support", "initial"
+))
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _file_cluster_key(name: str) -> str:
+    """Group files by directory, falling back to extension for bare names."""
+    directory, _, basename = name.replace("\\", "/").rpartition("/")
+    if directory:
+        return directory + "/"
+    _, dot, extension = basename.rpartition(".")
+    return "*." + extension.lower() if dot and extension else "(no extension)"
+
+
+def _intent_cluster_key(label: str) -> str:
+    """Group intents by their first meaningful word ("Add user auth" ~ "auth fix" ~ "user")."""
+    words = [word for word in _WORD_RE.findall(label.lower()) if word not in _INTENT_STOPWORDS]
+    if not words:
+        return "(misc)"
+    # Crude stemming so "tokens"/"token" and "caching"/"cache" land together
+    word = words[0]
+    for suffix in ("ing", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
 
 class Sephirot:
     """
     The Graph Visualizer.
     Now with 100% more Glow and Cyber-Aesthetics.
+
+    The graph itself is stored compactly: node names are interned to integer
+    ids and edges live in parallel typed arrays (source, target, weight, type).
+    All presentation (colors, glow, fonts) is derived from `node_type` at
+    render/export time, never stored per node.
+
+    Past `lod_threshold` nodes the page switches to a level-of-detail view:
+    files clustered by directory (or extension), intents by their leading
+    keyword, with aggregated edges, a server-side layout and physics off.
+    Cluster membership and cluster edge weights are maintained on insert,
+    so the clustered view costs O(clusters), not O(nodes), to render.
+
+    `graph_at(timestamp, scribe)` answers "what did the graph look like
+    then?" from checkpoints taken every `checkpoint_every` graph events,
+    replaying only the events since the nearest one.
     """
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, full_render_interval: float = 60.0, delta_poll_ms: int = 2000,
+                 lod_threshold: int = 2000, layout_path: Optional[str] = None,
+                 checkpoint_every: int = 500):
+        # --- THE CORE ---
+        self._names: List[str] = []          # node id -> name
+        self._ids: Dict[str, int] = {}       # name -> node id
+        self._node_types = array("B")        # node id -> index into NODE_TYPES
+        self._type_counts = [0] * len(NODE_TYPES)
+        self._edge_ids: Dict[int, int] = {}  # (source id << 32 | target id) -> edge id
+        self._edge_source = array("I")
+        self._edge_target = array("I")
+        self._edge_weight = array("I")
+        self._edge_type = array("B")         # edge id -> index into self._edge_type_names
+        self._edge_type_names: List[str] = list(EDGE_TYPES)
+
+        # --- LEVEL OF DETAIL ---
+        self.lod_threshold = lod_threshold   # 0 disables clustering
+        self._node_cluster = array("I")      # node id -> cluster id
+        self._cluster_keys: List[str] = []   # cluster id -> key
+        self._cluster_ids: Dict[str, int] = {}
+        self._cluster_types = array("B")     # cluster id -> index into NODE_TYPES
+        self._cluster_sizes = array("I")
+        self._cluster_edges: Dict[int, int] = {}  # (source cluster << 32 | target cluster) -> total weight
+        self._changed_clusters = set()
+        self._changed_cluster_edges = set()
+        self._render_lod = False
+
+        # --- LAYOUT ---
+        # Positions are computed once per node (keyed by name, so they survive
+        # rebuilds), persisted, and shipped as fixed coordinates - the browser
+        # never runs a force simulation
+        self.layout_path = layout_path
+        self._node_positions: Dict[str, Tuple[float, float]] = {}
+        self._cluster_positions: Dict[str, Tuple[float, float]] = {}
+        self._layout_dirty = False
+
+        # --- TIME TRAVEL ---
+        self.checkpoint_every = checkpoint_every
+        self._timeline: Optional["_Timeline"] = None
+
+        # --- INCREMENTAL RENDERING ---
+        # Node/edge ids touched since the last full HTML render; shipped as a delta
+        self.full_render_interval = full_render_interval
+        self.delta_poll_ms = delta_poll_ms
+        self._changed_nodes = set()
+        self._changed_edges = set()
+        self._render_base = 0
+        self._delta_seq = 0
+        self._last_full_render: Optional[float] = None
+        # The HTML lacks changes only the delta file carries (file:// pages never see those)
+        self._html_behind = False
+        # Guards the graph: mutations come from the watcher, renders from RenderWorker
+        self.lock = threading.RLock()
+        if layout_path:
+            self.load_layout()
 
         # --- THE PALETTE ---
         self.c_file = "#FFD700"   # Gold (Matter)
@@ -19,90 +162,543 @@ class Sephirot:
         self.c_edge = "rgba(255, 255, 255, 0.6)" # Translucent White
 
     def clear(self):
-        self.graph.clear()
+        with self.lock:
+            self._names.clear()
+            self._ids.clear()
+            self._node_types = array("B")
+            self._type_counts = [0] * len(NODE_TYPES)
+            self._edge_ids.clear()
+            self._edge_source = array("I")
+            self._edge_target = array("I")
+            self._edge_weight = array("I")
+            self._edge_type = array("B")
+            self._node_cluster = array("I")
+            self._cluster_keys.clear()
+            self._cluster_ids.clear()
+            self._cluster_types = array("B")
+            self._cluster_sizes = array("I")
+            self._cluster_edges.clear()
+            self._changed_nodes.clear()
+            self._changed_edges.clear()
+            self._changed_clusters.clear()
+            self._changed_cluster_edges.clear()
+            self._last_full_render = None
 
-    def rebuild_from_chronicles(self, events: List[AngelEvent]):
+    def rebuild_from_chronicles(self, events: Iterable[AngelEvent]) -> int:
         """Replays history to build current state."""
-        self.graph.clear()
+        self.clear()
+        return self.replay(events)
+
+    def replay(self, events: Iterable[AngelEvent]) -> int:
+        """Apply events on top of the current state. Returns how many were seen."""
+        seen = 0
         for event in events:
-            if event.action_type == "PROPOSAL_CONFIRMED" and event.edge:
-                self._add_connection(
-                    event.edge.source,
-                    event.edge.target,
-                    event.edge.edge_type
-                )
+            seen += 1
+            if event.action_type in GRAPH_EVENTS and event.edge:
+                with self.lock:
+                    self._add_connection(
+                        event.edge.source,
+                        event.edge.target,
+                        event.edge.edge_type
+                    )
+        return seen
+
+    def to_snapshot(self) -> dict:
+        """Compact, JSON-ready form of the graph (topology + weights only)."""
+        with self.lock:
+            return {
+                "nodes": [[name, NODE_TYPES[t]] for name, t in zip(self._names, self._node_types)],
+                "edges": [
+                    [
+                        self._names[self._edge_source[e]],
+                        self._names[self._edge_target[e]],
+                        self._edge_type_names[self._edge_type[e]],
+                        self._edge_weight[e]
+                    ]
+                    for e in range(len(self._edge_weight))
+                ]
+            }
+
+    def load_snapshot(self, state: dict):
+        """Restore the graph from `to_snapshot()` output."""
+        with self.lock:
+            self.clear()
+            for node, node_type in state.get("nodes", []):
+                self._node_id(node, node_type if node_type in NODE_TYPES else "intent")
+            for source, target, edge_type, weight in state.get("edges", []):
+                self._add_connection(source, target, edge_type, weight=weight)
+
+    def graph_at(self, timestamp: str, scribe) -> "Sephirot":
+        """
+        The graph as it stood at `timestamp`: every confirmation recorded up
+        to the first one stamped later than it (history order, like the
+        Chronicles themselves). Returns a new, independent Sephirot.
+
+        The first call indexes the whole history once; later calls only
+        catch up on new events, restore the nearest checkpoint and replay
+        at most `checkpoint_every` events from the log.
+        """
+        with self.lock:
+            if self._timeline is None:
+                self._timeline = _Timeline(self.checkpoint_every)
+            timeline = self._timeline
+        start, checkpoint = timeline.seek(timestamp, scribe)
+
+        graph = Sephirot(
+            full_render_interval=self.full_render_interval,
+            delta_poll_ms=self.delta_poll_ms,
+            lod_threshold=self.lod_threshold
+        )
+        with self.lock:
+            # Shared names -> shared positions, so scrubbing doesn't re-shuffle
+            graph._node_positions = dict(self._node_positions)
+            graph._cluster_positions = dict(self._cluster_positions)
+        if checkpoint is not None:
+            graph._restore(timeline.history, *checkpoint)
+        for _, event in scribe.iter_records(start=start, action_types=GRAPH_EVENTS):
+            if event.timestamp > timestamp:
+                break
+            if event.edge:
+                graph._add_connection(event.edge.source, event.edge.target, event.edge.edge_type)
+        return graph
+
+    def _restore(self, history: "Sephirot", node_count: int, edge_count: int, weights: array, types: array):
+        """
+        Become the first `node_count` nodes / `edge_count` edges of `history`
+        with the given edge weights and types. Ids are handed out in history
+        order, so any earlier state is a prefix of the later arrays.
+        """
+        self.clear()
+        self._names = history._names[:node_count]
+        self._ids = dict(zip(self._names, range(node_count)))
+        self._node_types = history._node_types[:node_count]
+        self._type_counts = [self._node_types.count(code) for code in range(len(NODE_TYPES))]
+        self._edge_source = history._edge_source[:edge_count]
+        self._edge_target = history._edge_target[:edge_count]
+        self._edge_weight = array("I", weights)
+        self._edge_type = array("B", types)
+        self._edge_type_names = list(history._edge_type_names)
+
+        # Rebuild the lookup tables vectorized - this is the hot part of a scrub
+        sources = np.frombuffer(self._edge_source, dtype=np.uint32).astype(np.uint64)
+        targets = np.frombuffer(self._edge_target, dtype=np.uint32).astype(np.uint64)
+        self._edge_ids = dict(zip((sources << 32 | targets).tolist(), range(edge_count)))
+
+        self._node_cluster = history._node_cluster[:node_count]
+        clusters = np.frombuffer(self._node_cluster, dtype=np.uint32)
+        cluster_count = int(clusters.max()) + 1 if node_count else 0
+        self._cluster_keys = history._cluster_keys[:cluster_count]
+        self._cluster_ids = dict(zip(self._cluster_keys, range(cluster_count)))
+        self._cluster_types = history._cluster_types[:cluster_count]
+        sizes = np.bincount(clusters, minlength=cluster_count)
+        self._cluster_sizes = array("I", sizes.astype(np.uint32).tobytes())
+        if edge_count:
+            cluster_pairs = clusters[sources].astype(np.uint64) << 32 | clusters[targets]
+            keys, inverse = np.unique(cluster_pairs, return_inverse=True)
+            totals = np.bincount(inverse, weights=np.frombuffer(self._edge_weight, dtype=np.uint32))
+            self._cluster_edges = dict(zip(keys.tolist(), totals.astype(np.int64).tolist()))
+        # Dirty sets stay empty: a restored graph has never been rendered, so
+        # its first update_view() is a full render anyway
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Materialize a styled NetworkX graph (for export or ad-hoc analysis)."""
+        graph = nx.DiGraph()
+        with self.lock:
+            for node_id in range(len(self._names)):
+                node = self._vis_node(node_id)
+                graph.add_node(node.pop("id"), **node)
+            for edge_id in range(len(self._edge_weight)):
+                edge = self._vis_edge(edge_id)
+                del edge["id"]
+                graph.add_edge(edge.pop("from"), edge.pop("to"), **edge)
+        return graph
 
     def add_edge(self, edge: EdgeDef):
         """Add an edge from a proposal confirmation."""
-        self._add_connection(edge.source, edge.target, edge.edge_type)
-
-    def _add_connection(self, source: str, target: str, edge_label: str):
-        safe_source = html.escape(source)
-        safe_target = html.escape(target)
-        safe_edge_label = html.escape(edge_label)
-
-        # 1. Add File Node (Gold Square with Glow)
-        if source not in self.graph:
-            self.graph.add_node(
-                source,
-                label=safe_source,
-                color=self.c_file,
-                shape="square",
-                size=25,
-                title=f"File: {safe_source}",
-                shadow={'enabled': True, 'color': self.c_file, 'size': 15, 'x': 0, 'y': 0},
-                font={'face': 'Courier New', 'color': 'white', 'size': 16},
-                node_type="file"
-            )
+        with self.lock:
+            self._add_connection(edge.source, edge.target, edge.edge_type)
 
-        # 2. Add Intent Node (Pink Dot with Glow)
-        if target not in self.graph:
-            self.graph.add_node(
-                target,
-                label=safe_target,
-                color=self.c_intent,
-                shape="dot",
-                size=15,
-                title=f"Intent: {safe_target}",
-                shadow={'enabled': True, 'color': self.c_intent, 'size': 20, 'x': 0, 'y': 0},
-                font={'face': 'Courier New', 'color': 'white', 'size': 14},
-                node_type="intent"
-            )
+    def _node_id(self, name: str, node_type: str) -> int:
+        """Intern a node name, creating the node on first sight."""
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = len(self._names)
+            self._ids[name] = node_id
+            self._names.append(name)
+            type_code = NODE_TYPES.index(node_type)
+            self._node_types.append(type_code)
+            self._type_counts[type_code] += 1
+            self._changed_nodes.add(node_id)
 
-        # 3. Add Edge (White Fiber Optic)
-        # Increase width based on 'weight' (how many times confirmed)
-        weight = 1
-        if self.graph.has_edge(source, target):
-            weight = self.graph[source][target].get('width', 1) + 1
-
-        self.graph.add_edge(
-            source,
-            target,
-            width=weight,
-            title=f"Strength: {weight}",
-            label=safe_edge_label,
-            color={'color': 'white', 'opacity': 0.6},
-            font={'align': 'middle', 'face': 'Courier New', 'color': 'gray', 'size': 10}
-        )
+            if node_type == "file":
+                key = "file:" + _file_cluster_key(name)
+            else:
+                key = "intent:" + _intent_cluster_key(name)
+            cluster_id = self._cluster_ids.get(key)
+            if cluster_id is None:
+                cluster_id = len(self._cluster_keys)
+                self._cluster_ids[key] = cluster_id
+                self._cluster_keys.append(key)
+                self._cluster_types.append(type_code)
+                self._cluster_sizes.append(0)
+            self._cluster_sizes[cluster_id] += 1
+            self._node_cluster.append(cluster_id)
+            self._changed_clusters.add(cluster_id)
+        return node_id
 
-    def get_stats(self) -> dict:
-        """Get graph statistics."""
-        nodes = list(self.graph.nodes(data=True))
+    def _add_connection(self, source: str, target: str, edge_label: str, weight: int = None):
+        # 1. File Node, 2. Intent Node
+        source_id = self._node_id(source, "file")
+        target_id = self._node_id(target, "intent")
+
+        type_code = self._edge_type_code(edge_label)
+
+        # 3. Edge - weight counts how many times it was confirmed
+        key = source_id << 32 | target_id
+        edge_id = self._edge_ids.get(key)
+        if edge_id is None:
+            edge_id = len(self._edge_weight)
+            self._edge_ids[key] = edge_id
+            self._edge_source.append(source_id)
+            self._edge_target.append(target_id)
+            self._edge_weight.append(1 if weight is None else weight)
+            self._edge_type.append(type_code)
+            added = self._edge_weight[edge_id]
+        else:
+            previous = self._edge_weight[edge_id]
+            self._edge_weight[edge_id] = previous + 1 if weight is None else weight
+            self._edge_type[edge_id] = type_code
+            added = self._edge_weight[edge_id] - previous
+        self._changed_edges.add(edge_id)
+
+        # Keep the clustered view's aggregated edge in step
+        cluster_key = self._node_cluster[source_id] << 32 | self._node_cluster[target_id]
+        self._cluster_edges[cluster_key] = self._cluster_edges.get(cluster_key, 0) + added
+        self._changed_cluster_edges.add(cluster_key)
+
+    def _edge_type_code(self, edge_label: str) -> int:
+        try:
+            return self._edge_type_names.index(edge_label)
+        except ValueError:
+            self._edge_type_names.append(edge_label)
+            return len(self._edge_type_names) - 1
+
+    def _vis_node(self, node_id: int) -> dict:
+        """Presentation attributes for a node, derived from its type."""
+        name = self._names[node_id]
+        safe_name = html.escape(name)
+        x, y = self._node_positions.get(name, (0.0, 0.0))
+        if NODE_TYPES[self._node_types[node_id]] == "file":
+            # Gold Square with Glow
+            return {
+                "id": name,
+                "label": safe_name,
+                "color": self.c_file,
+                "shape": "square",
+                "size": 25,
+                "title": f"File: {safe_name}",
+                "shadow": {'enabled': True, 'color': self.c_file, 'size': 15, 'x': 0, 'y': 0},
+                "font": {'face': 'Courier New', 'color': 'white', 'size': 16},
+                "x": x,
+                "y": y,
+                "node_type": "file"
+            }
+        # Pink Dot with Glow
+        return {
+            "id": name,
+            "label": safe_name,
+            "color": self.c_intent,
+            "shape": "dot",
+            "size": 15,
+            "title": f"Intent: {safe_name}",
+            "shadow": {'enabled': True, 'color': self.c_intent, 'size': 20, 'x': 0, 'y': 0},
+            "font": {'face': 'Courier New', 'color': 'white', 'size': 14},
+            "x": x,
+            "y": y,
+            "node_type": "intent"
+        }
+
+    def _vis_edge(self, edge_id: int) -> dict:
+        """Presentation attributes for an edge (White Fiber Optic)."""
+        source = self._names[self._edge_source[edge_id]]
+        target = self._names[self._edge_target[edge_id]]
+        edge_type = self._edge_type_names[self._edge_type[edge_id]]
+        weight = self._edge_weight[edge_id]
+        return {
+            # Stable ids let the page update an edge in place instead of duplicating it
+            "id": json.dumps([source, target]),
+            "from": source,
+            "to": target,
+            "width": weight,
+            "title": f"Strength: {weight}",
+            "label": html.escape(edge_type),
+            "edge_type": edge_type,
+            "color": {'color': 'white', 'opacity': 0.6},
+            "font": {'align': 'middle', 'face': 'Courier New', 'color': 'gray', 'size': 10}
+        }
+
+    def _vis_cluster(self, cluster_id: int) -> dict:
+        """Presentation attributes for a level-of-detail super-node."""
+        node_type, _, label = self._cluster_keys[cluster_id].partition(":")
+        size = self._cluster_sizes[cluster_id]
+        safe_label = html.escape(label)
+        color = self.c_file if node_type == "file" else self.c_intent
+        x, y = self._cluster_positions.get(self._cluster_keys[cluster_id], (0.0, 0.0))
+        return {
+            "id": self._cluster_keys[cluster_id],
+            "label": f"{safe_label} ({size})",
+            "color": color,
+            "shape": "square" if node_type == "file" else "dot",
+            "size": 15 + 6 * math.log2(size),
+            "title": f"{node_type.title()} cluster: {safe_label} - {size} nodes",
+            "font": {'face': 'Courier New', 'color': 'white', 'size': 16},
+            "x": x,
+            "y": y,
+            "node_type": node_type
+        }
+
+    def _vis_cluster_edge(self, cluster_key: int) -> dict:
+        """Presentation attributes for an aggregated edge between two clusters."""
+        source = self._cluster_keys[cluster_key >> 32]
+        target = self._cluster_keys[cluster_key & 0xFFFFFFFF]
+        weight = self._cluster_edges[cluster_key]
         return {
-            "total_nodes": len(nodes),
-            "files": sum(1 for _, d in nodes if d.get("node_type") == "file"),
-            "intents": sum(1 for _, d in nodes if d.get("node_type") == "intent"),
-            "edges": self.graph.number_of_edges()
+            "id": json.dumps([source, target]),
+            "from": source,
+            "to": target,
+            "width": 1 + math.log2(max(weight, 1)),
+            "title": f"Strength: {weight}",
+            "color": {'color': 'white', 'opacity': 0.4}
         }
 
+    def _use_lod(self) -> bool:
+        return bool(self.lod_threshold) and len(self._names) > self.lod_threshold
+
+    def _layout_clusters(self, spring: bool = True):
+        """
+        Place clusters that have no position yet. With `spring`, takes the
+        lock only to copy the graph and to merge the result, so a full
+        spring layout never blocks mutations; without it, places by
+        neighbours only and must be called with the lock held.
+        """
+        if not spring:
+            pairs = ((key >> 32, key & 0xFFFFFFFF) for key in self._cluster_edges)
+            if _warm_layout(self._cluster_keys, pairs, self._cluster_positions, spring=False):
+                self._layout_dirty = True
+            return
+        with self.lock:
+            if all(key in self._cluster_positions for key in self._cluster_keys):
+                return
+            keys = list(self._cluster_keys)
+            pairs = [(key >> 32, key & 0xFFFFFFFF) for key in self._cluster_edges]
+            positions = dict(self._cluster_positions)
+        self._merge_layout(keys, pairs, positions, self._cluster_positions)
+
+    def _layout_nodes(self, spring: bool = True):
+        """Place nodes that have no position yet (see `_layout_clusters`)."""
+        if not spring:
+            pairs = zip(self._edge_source, self._edge_target)
+            if _warm_layout(self._names, pairs, self._node_positions, spring=False):
+                self._layout_dirty = True
+            return
+        with self.lock:
+            if all(name in self._node_positions for name in self._names):
+                return
+            keys = list(self._names)
+            pairs = list(zip(self._edge_source, self._edge_target))
+            positions = dict(self._node_positions)
+        self._merge_layout(keys, pairs, positions, self._node_positions)
+
+    def _merge_layout(self, keys: List[str], pairs: List[Tuple[int, int]],
+                      positions: Dict[str, Tuple[float, float]], target: Dict[str, Tuple[float, float]]):
+        if not _warm_layout(keys, pairs, positions):
+            return
+        with self.lock:
+            # Positions placed meanwhile (by a delta render) win
+            for key in keys:
+                target.setdefault(key, positions[key])
+            self._layout_dirty = True
+
+    def load_layout(self, path: Optional[str] = None):
+        """Restore cached positions (keyed by name, so they survive rebuilds)."""
+        path = Path(path or self.layout_path)
+        if not path.exists():
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                layout = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self.lock:
+            self._node_positions = {name: tuple(xy) for name, xy in layout.get("nodes", {}).items()}
+            self._cluster_positions = {key: tuple(xy) for key, xy in layout.get("clusters", {}).items()}
+            self._layout_dirty = False
+
+    def save_layout(self, path: Optional[str] = None):
+        """Persist positions if any were added since the last save."""
+        path = path or self.layout_path
+        with self.lock:
+            if not path or not self._layout_dirty:
+                return
+            layout = {
+                "nodes": {name: [round(x, 1), round(y, 1)] for name, (x, y) in self._node_positions.items()},
+                "clusters": {key: [round(x, 1), round(y, 1)] for key, (x, y) in self._cluster_positions.items()}
+            }
+            self._layout_dirty = False
+        _write_atomic(Path(path), json.dumps(layout))
+
+    def get_stats(self) -> dict:
+        """Get graph statistics (O(1) - counters are maintained on insert)."""
+        with self.lock:
+            return {
+                "total_nodes": len(self._names),
+                "files": self._type_counts[NODE_TYPES.index("file")],
+                "intents": self._type_counts[NODE_TYPES.index("intent")],
+                "edges": len(self._edge_weight)
+            }
+
+    def update_view(self, output_file: str = "angel_traceability.html") -> str:
+        """
+        Refresh the visualization as cheaply as possible: a delta file for
+        open pages, with a full HTML render only when none exists yet or
+        `full_render_interval` seconds have passed since the last one.
+        """
+        with self.lock:
+            full_due = (
+                self._last_full_render is None
+                or not Path(output_file).exists()
+                or time.monotonic() - self._last_full_render >= self.full_render_interval
+            )
+            changed = bool(self._changed_nodes or self._changed_edges)
+            # Crossing the threshold changes what the page is made of
+            full_due = full_due or self._use_lod() != self._render_lod
+        if full_due:
+            return self.manifest(output_file)
+        if changed:
+            self.manifest_delta(output_file)
+        return output_file
+
+    def full_render_due_in(self) -> Optional[float]:
+        """
+        Seconds until a full render would fold the outstanding deltas into
+        the HTML (0 if it is due now), or None when the HTML is up to date.
+        """
+        with self.lock:
+            if not self._html_behind or self._last_full_render is None:
+                return None
+            return max(0.0, self._last_full_render + self.full_render_interval - time.monotonic())
+
+    def manifest_delta(self, output_file: str = "angel_traceability.html") -> str:
+        """
+        Write every node/edge changed since the last full render to the
+        page's delta file (cumulative, so a page that missed a poll catches up).
+        """
+        with self.lock:
+            lod = self._render_lod
+        if lod:
+            self._layout_clusters()
+        else:
+            self._layout_nodes()
+        with self.lock:
+            self._delta_seq += 1
+            if self._render_lod:
+                self._layout_clusters(spring=False)
+                nodes = [self._vis_cluster(c) for c in sorted(self._changed_clusters)]
+                edges = [self._vis_cluster_edge(key) for key in sorted(self._changed_cluster_edges)]
+            else:
+                self._layout_nodes(spring=False)
+                nodes = [self._vis_node(node_id) for node_id in sorted(self._changed_nodes)]
+                edges = [self._vis_edge(edge_id) for edge_id in sorted(self._changed_edges)]
+            delta = {
+                "base": self._render_base,
+                "seq": self._delta_seq,
+                "nodes": nodes,
+                "edges": edges
+            }
+            self._html_behind = bool(nodes or edges)
+        delta_file = self._delta_path(output_file)
+        _write_atomic(delta_file, json.dumps(delta))
+        return str(delta_file)
+
+    def drain_changes(self) -> dict:
+        """
+        Return every node/edge changed since the last call and forget them.
+        For graphs that are streamed rather than rendered to HTML (it
+        shares the dirty sets `manifest()` relies on).
+        """
+        with self.lock:
+            delta = {
+                "nodes": [self._vis_node(node_id) for node_id in sorted(self._changed_nodes)],
+                "edges": [self._vis_edge(edge_id) for edge_id in sorted(self._changed_edges)]
+            }
+            self._changed_nodes.clear()
+            self._changed_edges.clear()
+            self._changed_clusters.clear()
+            self._changed_cluster_edges.clear()
+        return delta
+
+    def describe_edges(self, pairs: Iterable[Tuple[str, str]]) -> dict:
+        """Current presentation of the given (source, target) edges and their endpoints."""
+        with self.lock:
+            node_ids, edge_ids = set(), set()
+            for source, target in pairs:
+                source_id, target_id = self._ids.get(source), self._ids.get(target)
+                if source_id is None or target_id is None:
+                    continue
+                edge_id = self._edge_ids.get(source_id << 32 | target_id)
+                if edge_id is not None:
+                    node_ids.update((source_id, target_id))
+                    edge_ids.add(edge_id)
+            return {
+                "nodes": [self._vis_node(node_id) for node_id in sorted(node_ids)],
+                "edges": [self._vis_edge(edge_id) for edge_id in sorted(edge_ids)]
+            }
+
+    @staticmethod
+    def _delta_path(output_file: str) -> Path:
+        path = Path(output_file)
+        return path.with_name(path.stem + ".delta.json")
+
     def manifest(self, output_file: str = "angel_traceability.html"):
         """Generate the cyber-aesthetic HTML visualization."""
+        # The layout runs outside the lock; only what was added meanwhile is placed under it
+        with self.lock:
+            lod = self._use_lod()
+        if lod:
+            self._layout_clusters()
+        else:
+            self._layout_nodes()
+        # Copy out what the page needs, so mutations can continue while we render
+        with self.lock:
+            lod = self._use_lod()
+            if lod:
+                self._layout_clusters(spring=False)
+                nodes = [self._vis_cluster(c) for c in range(len(self._cluster_keys))]
+                edges = [self._vis_cluster_edge(key) for key in self._cluster_edges]
+            else:
+                self._layout_nodes(spring=False)
+                nodes = [self._vis_node(node_id) for node_id in range(len(self._names))]
+                edges = [self._vis_edge(edge_id) for edge_id in range(len(self._edge_weight))]
+            # New base: open pages reload, and the delta restarts empty
+            self._render_base += 1
+            self._render_lod = lod
+            self._delta_seq = 0
+            self._changed_nodes.clear()
+            self._changed_edges.clear()
+            self._changed_clusters.clear()
+            self._changed_cluster_edges.clear()
+            base = self._render_base
+
         # Dark Mode Background
         net = Network(height="100vh", width="100%", bgcolor="#000000", font_color="white")
-        net.from_nx(self.graph)
+        # Filled directly rather than via from_nx, which is quadratic in the edge count
+        net.nodes = nodes
+        net.node_ids = [node["id"] for node in nodes]
+        net.edges = edges
 
         # --- THE PHYSICS ENGINE ---
-        # BarnesHut is stable for large graphs with gentle breathing motion
+        # Switched off: every node arrives with a cached position, so the
+        # browser draws once instead of re-simulating the layout on each load
         options = """
         {
           "nodes": {
@@ -110,25 +706,315 @@ class Sephirot:
             "borderWidthSelected": 4
           },
           "edges": {
-            "smooth": {
-              "type": "continuous",
-              "forceDirection": "none"
-            }
+            "smooth": %(smooth)s
           },
           "physics": {
-            "barnesHut": {
-              "gravitationalConstant": -3000,
-              "centralGravity": 0.3,
-              "springLength": 150,
-              "springConstant": 0.04,
-              "damping": 0.09,
-              "avoidOverlap": 0.2
-            },
-            "minVelocity": 0.75
+            "enabled": false
+          },
+          "interaction": {
+            "hideEdgesOnDrag": %(hide_edges)s
           }
         }
-        """
+        """ % {
+            # Curved edges are costly to draw; the clustered view keeps them straight
+            "smooth": "false" if lod else '{"type": "continuous", "forceDirection": "none"}',
+            "hide_edges": "true" if lod else "false"
+        }
         net.set_options(options)
 
-        net.save_graph(output_file)
+        # Render next to the target, then swap it in atomically
+        output_path = Path(output_file)
+        tmp_path = output_path.with_name(output_path.stem + ".rendering.html")
+        net.write_html(str(tmp_path))
+        page = tmp_path.read_text(encoding="utf-8")
+        script = _DELTA_SCRIPT % {
+            "base": base,
+            "delta_url": json.dumps(self._delta_path(output_file).name),
+            "poll_ms": self.delta_poll_ms
+        }
+        _write_atomic(output_path, page.replace("</body>", script + "</body>", 1))
+        tmp_path.unlink()
+
+        with self.lock:
+            self._last_full_render = time.monotonic()
+        self.manifest_delta(output_file)
+        self.save_layout()
         return output_file
+
+
+class _Timeline:
+    """
+    The River of Time: a private full-history graph plus checkpoints of
+    it every `every` graph events, for `Sephirot.graph_at()`.
+
+    A checkpoint is (node count, edge count) at a log position plus the
+    ids, weights and types of the edges touched since the previous
+    checkpoint. Nodes and edges are only ever appended, so layering those
+    diffs in order rebuilds every edge weight and type, and the history
+    arrays supply the rest - memory grows with the number of events, not
+    with edges x checkpoints.
+    """
+
+    def __init__(self, every: int):
+        self.every = max(1, every)
+        self.history = Sephirot(lod_threshold=0)
+        self.position = None             # Log position the history has caught up to
+        self.replayed = 0
+        self.max_timestamp = ""
+        self.floors: List[str] = []      # Highest timestamp before each checkpoint
+        self.positions: list = []        # Log position of each checkpoint
+        self.checkpoints: List[tuple] = []
+        self.lock = threading.Lock()
+
+    def seek(self, timestamp: str, scribe) -> tuple:
+        """
+        (log position, (node count, edge count, edge weights, edge types))
+        from which to replay up to `timestamp`.
+        """
+        with self.lock:
+            self._catch_up(scribe)
+            # Last checkpoint whose preceding events are all <= timestamp
+            i = bisect_right(self.floors, timestamp) - 1
+            if i < 0:
+                return None, None
+            node_count, edge_count = self.checkpoints[i][:2]
+            weights = np.zeros(edge_count, dtype=np.uint32)
+            types = np.zeros(edge_count, dtype=np.uint8)
+            for _, _, ids, changed_weights, changed_types in self.checkpoints[:i + 1]:
+                weights[ids] = changed_weights
+                types[ids] = changed_types
+            return self.positions[i], (node_count, edge_count, array("I", weights.tobytes()), array("B", types.tobytes()))
+
+    def _catch_up(self, scribe):
+        history = self.history
+        for position, event in scribe.iter_records(start=self.position, action_types=GRAPH_EVENTS):
+            if event.edge:
+                history._add_connection(event.edge.source, event.edge.target, event.edge.edge_type)
+            self.position = position
+            self.replayed += 1
+            if event.timestamp > self.max_timestamp:
+                self.max_timestamp = event.timestamp
+            if self.replayed % self.every == 0:
+                # The history's dirty edge set is exactly what changed since the last checkpoint
+                ids = np.fromiter(sorted(history._changed_edges), dtype=np.intp, count=len(history._changed_edges))
+                self.floors.append(self.max_timestamp)
+                self.positions.append(position)
+                self.checkpoints.append((
+                    len(history._names),
+                    len(history._edge_weight),
+                    ids.astype(np.uint32),
+                    np.frombuffer(history._edge_weight, dtype=np.uint32)[ids],
+                    np.frombuffer(history._edge_type, dtype=np.uint8)[ids]
+                ))
+                history._changed_edges.clear()
+        # The history is never rendered; don't let its other dirty sets grow forever
+        history._changed_nodes.clear()
+        history._changed_clusters.clear()
+        history._changed_cluster_edges.clear()
+
+
+def _write_atomic(path: Path, content: str):
+    """Write via a temp file + rename so readers never see a half-written file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Above this many nodes a from-scratch spring layout is too slow (and too big) to run inline
+_SPRING_LAYOUT_LIMIT = 2000
+# Typical distance between neighbouring nodes, in vis.js canvas units
+_LAYOUT_SPACING = 120.0
+_GOLDEN_ANGLE = 2.399963
+
+
+def _warm_layout(keys: List[str], pairs: Iterable[Tuple[int, int]],
+                 positions: Dict[str, Tuple[float, float]], spring: bool = True) -> bool:
+    """
+    Give every key in `keys` a position in `positions` (ids index `keys`,
+    `pairs` are the edges between them). Existing positions never move.
+
+    The first layout is a spring layout over the whole graph (unless
+    `spring` is False); after that new nodes are warm-started next to the
+    mean of their placed neighbours, or on a sunflower spiral around the
+    origin when they have none.
+    Returns whether anything was placed.
+    """
+    missing = [i for i, key in enumerate(keys) if key not in positions]
+    if not missing:
+        return False
+
+    if spring and len(missing) == len(keys) and len(keys) <= _SPRING_LAYOUT_LIMIT:
+        layout = _spring_layout(len(keys), pairs)
+        for i, (x, y) in enumerate(layout.tolist()):
+            positions[keys[i]] = (x, y)
+        return True
+
+    wanted = set(missing)
+    neighbours: Dict[int, List[int]] = {}
+    for source, target in pairs:
+        if source in wanted:
+            neighbours.setdefault(source, []).append(target)
+        if target in wanted:
+            neighbours.setdefault(target, []).append(source)
+
+    for i in missing:
+        placed = [positions[keys[n]] for n in neighbours.get(i, ()) if keys[n] in positions]
+        if placed:
+            x = sum(p[0] for p in placed) / len(placed)
+            y = sum(p[1] for p in placed) / len(placed)
+            radius = _LAYOUT_SPACING / 2
+        else:
+            x = y = 0.0
+            radius = _LAYOUT_SPACING / 2 * math.sqrt(len(positions) + 1)
+        # Deterministic offset so siblings don't stack on one point
+        angle = i * _GOLDEN_ANGLE
+        positions[keys[i]] = (x + radius * math.cos(angle), y + radius * math.sin(angle))
+    return True
+
+
+def _spring_layout(count: int, pairs: Iterable[Tuple[int, int]], iterations: int = 50) -> np.ndarray:
+    """
+    Fruchterman-Reingold on a dense adjacency matrix (O(n^2) per iteration).
+    Self-contained so it needs only NumPy - networkx's version wants SciPy
+    past a few hundred nodes. Returns (count, 2) positions in canvas units.
+    """
+    adjacency = np.zeros((count, count), dtype=np.float32)
+    for source, target in pairs:
+        if source != target:
+            adjacency[source, target] = adjacency[target, source] = 1.0
+    positions = np.random.default_rng(7).random((count, 2), dtype=np.float32)
+    k = math.sqrt(1.0 / count)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    x, y = positions[:, 0], positions[:, 1]
+    for _ in range(iterations):
+        dx = x[:, np.newaxis] - x[np.newaxis, :]
+        dy = y[:, np.newaxis] - y[np.newaxis, :]
+        distance = np.maximum(np.sqrt(dx * dx + dy * dy), 0.01)
+        # Repulsion between every pair, attraction along edges
+        force = k * k / (distance * distance) - adjacency * (distance / k)
+        move_x = (dx * force).sum(axis=1)
+        move_y = (dy * force).sum(axis=1)
+        step = temperature / np.maximum(np.sqrt(move_x * move_x + move_y * move_y), 0.01)
+        x += move_x * step
+        y += move_y * step
+        temperature -= cooling
+
+    positions -= positions.mean(axis=0)
+    extent = np.abs(positions).max() or 1.0
+    return positions * (_LAYOUT_SPACING * math.sqrt(count) / extent)
+
+
+class RenderWorker:
+    """
+    Renders the constellation on a dedicated thread so the per-save path
+    is only analyze -> record -> graph mutation.
+    Requests coalesce: however many arrive while a render runs, the
+    worker does one more pass over the latest graph (latest wins).
+
+    Between full renders, changes only reach the delta file, which a page
+    can fetch only when served over http. So while deltas are
+    outstanding the worker schedules a trailing full render for when
+    `full_render_interval` has passed, and `stop()` always ends with one:
+    the HTML opened from disk is never left behind the graph.
+    """
+
+    def __init__(self, sephirot: Sephirot, output_file: str = "angel_traceability.html"):
+        self.sephirot = sephirot
+        self.output_file = output_file
+        self._condition = threading.Condition()
+        self._pending = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # --- METRICS ---
+        self.renders = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="angel-renderer", daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Ask for a render; never blocks on rendering."""
+        with self._condition:
+            self.requests += 1
+            if self._pending:
+                self.coalesced += 1
+            self._pending = True
+            self._condition.notify()
+
+    def stop(self, flush: bool = True, timeout: Optional[float] = None):
+        """
+        Stop the worker, finishing any outstanding request first if `flush`,
+        then write a full render of the final graph.
+        """
+        with self._condition:
+            self._running = False
+            if not flush:
+                self._pending = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return  # Still rendering; two writers would race on the same files
+            self._thread = None
+        self._render(full=True)
+
+    def metrics(self) -> dict:
+        """Render latency (seconds) and coalescing counters."""
+        return {
+            "renders": self.renders,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "last_latency": self.last_latency,
+            "avg_latency": self._total_latency / self.renders if self.renders else 0.0,
+            "max_latency": self.max_latency
+        }
+
+    def _run(self):
+        retry_at = 0.0  # A failed render isn't retried in a tight loop
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    due_in = self.sephirot.full_render_due_in()
+                    if due_in is not None:
+                        due_in = max(due_in, retry_at - time.monotonic())
+                        if due_in <= 0:
+                            break  # Trailing full render: update_view() finds it due
+                    self._condition.wait(due_in)
+                if not self._running and not self._pending:
+                    return
+                self._pending = False
+            if not self._render():
+                retry_at = time.monotonic() + self.sephirot.full_render_interval
+
+    def _render(self, full: bool = False) -> bool:
+        started = time.perf_counter()
+        try:
+            if full:
+                self.sephirot.manifest(self.output_file)
+            else:
+                self.sephirot.update_view(self.output_file)
+        except Exception:
+            # Keep serving later requests, but don't let the page go stale silently
+            self.errors += 1
+            traceback.print_exc()
+            return False
+        latency = time.perf_counter() - started
+        self.renders += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+        return True
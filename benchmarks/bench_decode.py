@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Chronicle decode benchmark.
+Compares events/sec for the legacy decode (json.loads + AngelEvent(**data)),
+the Scribe's current decode (model_validate_json), and an unvalidated
+model_construct path for reference.
+
+Run: python benchmarks/bench_decode.py [event_count]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from angel.chronicles import TheScribe  # noqa: E402
+from angel.types import AngelEvent, EdgeDef  # noqa: E402
+
+
+def write_chronicle(path: Path, count: int) -> None:
+    scribe = TheScribe(str(path))
+    for i in range(count):
+        filename = f"module_{i % 97}.py"
+        scribe.record(AngelEvent(action_type="WORK_UNIT_CAPTURED", file_path=filename))
+        scribe.record(AngelEvent(
+            action_type="PROPOSAL_CONFIRMED",
+            actor="Human",
+            file_path=filename,
+            proposal_id=f"p-{i}",
+            edge=EdgeDef(source=filename, target=f"Intent {i % 13}", edge_type="implements"),
+            explicit_approval=True,
+            justification="Benchmark confirmation"
+        ))
+    # Commit the last partial batch before the file is read back
+    scribe.close()
+
+
+def legacy_decode(line: bytes) -> AngelEvent:
+    return AngelEvent(**json.loads(line))
+
+
+def construct_decode(line: bytes) -> AngelEvent:
+    data = json.loads(line)
+    if data.get("edge") is not None:
+        data["edge"] = EdgeDef.model_construct(**data["edge"])
+    return AngelEvent.model_construct(**data)
+
+
+def bench(label: str, decode, lines) -> None:
+    start = time.perf_counter()
+    for line in lines:
+        decode(line)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {len(lines) / elapsed:>12,.0f} events/sec")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "angel_chronicles.jsonl"
+        write_chronicle(path, count // 2)
+        lines = [line for line in path.read_bytes().splitlines() if line.strip()]
+
+        print(f"Decoding {len(lines):,} chronicle lines")
+        bench("before: json.loads + AngelEvent(**data)", legacy_decode, lines)
+        bench("after: TheScribe._decode", TheScribe._decode, lines)
+        bench("reference: model_construct (no checks)", construct_decode, lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,33 +7,94 @@ from rich.text import Text
 
 from angel.voice import TheHerald, console
 from angel.eyes import VisionSystem
-from angel.wheels import Sephirot
+from angel.wheels import GRAPH_EVENTS, Sephirot, RenderWorker
 from angel.halo import HaloSystem
 from angel.brain import TheBrain
 from angel.chronicles import TheScribe
+from angel.trumpet import TheTrumpet
+from angel.choir import TheChoir
 from angel.types import AngelEvent, EdgeDef
 
-# 1. Load the Holy Laws
-with open("angel_config.yaml", "r") as f:
-    config = yaml.safe_load(f)
-
-# 2. Awaken Modules
-voice = TheHerald(name=config['angel_settings']['name'])
-halo = HaloSystem(config)
-wheels = Sephirot()
-brain = TheBrain(config)
-scribe = TheScribe("angel_chronicles.jsonl")
-
-# 3. Rebuild state from chronicles on startup
-read_limit = config.get("chronicles", {}).get("read_limit", 1000)
-existing_events = scribe.read_all(limit=read_limit)
-if existing_events:
-    wheels.rebuild_from_chronicles(existing_events)
-    voice.speak(
-        f"Restored {len(existing_events)} recent events from the Chronicles.",
-        style="angel.gold"
+
+def awaken():
+    """
+    Load the config, build every module and rebuild the graph from the
+    Chronicles. Kept out of import time: the Sentinel's spawned scan
+    workers re-import this module, and must not open the live log or
+    replay history themselves.
+    """
+    global config, voice, halo, wheels, renderer, brain, scribe, graph_is_complete
+
+    # 1. Load the Holy Laws
+    with open("angel_config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    # 2. Awaken Modules
+    voice = TheHerald(name=config['angel_settings']['name'])
+    halo = HaloSystem(config)
+    wheels_config = config.get("wheels", {})
+    wheels = Sephirot(
+        full_render_interval=wheels_config.get("full_render_seconds", 60.0),
+        delta_poll_ms=wheels_config.get("delta_poll_ms", 2000),
+        lod_threshold=wheels_config.get("lod_threshold", 2000),
+        layout_path=wheels_config.get("layout_path", "angel_layout.json"),
+        checkpoint_every=wheels_config.get("checkpoint_every", 500)
+    )
+    renderer = RenderWorker(wheels)
+    brain = TheBrain(config, halo=halo)
+    chronicles_config = config.get("chronicles", {})
+    scribe = TheScribe(
+        "angel_chronicles.jsonl",
+        index_stride=chronicles_config.get("index_stride", 256),
+        segment_max_bytes=chronicles_config.get("segment_max_bytes", 0),
+        snapshot_path=chronicles_config.get("snapshot_path", "angel_state.json"),
+        snapshot_every=chronicles_config.get("snapshot_every", 500),
+        durability=chronicles_config.get("durability", "flush"),
+        batch_size=chronicles_config.get("batch_size", 64),
+        flush_interval=chronicles_config.get("flush_interval", 0.5)
     )
 
+    # 3. Rebuild state from chronicles on startup
+    # Only confirmations (GRAPH_EVENTS) shape the graph; everything else is skipped before decoding.
+
+    # Prefer the compacted snapshot + only the events recorded after it.
+    snapshot = scribe.load_snapshot()
+    read_limit = chronicles_config.get("read_limit")
+    if snapshot:
+        state, position = snapshot
+        wheels.load_snapshot(state)
+        replayed = wheels.replay(scribe.iter_events(start=position, action_types=GRAPH_EVENTS))
+        voice.speak(
+            f"Restored snapshot plus {replayed} newer confirmations from the Chronicles.",
+            style="angel.gold"
+        )
+        # Only a graph built from the full history may be snapshotted
+        graph_is_complete = True
+    elif read_limit is None:
+        # Full-history replay, streamed so memory stays bounded by the graph itself
+        replayed = wheels.rebuild_from_chronicles(scribe.iter_events(action_types=GRAPH_EVENTS))
+        graph_is_complete = True
+        if replayed:
+            voice.speak(
+                f"Replayed {replayed} confirmations from the full Chronicles.",
+                style="angel.gold"
+            )
+    else:
+        existing_events = scribe.read_all(limit=read_limit)
+        graph_is_complete = len(existing_events) < read_limit
+        if existing_events:
+            wheels.rebuild_from_chronicles(existing_events)
+            voice.speak(
+                f"Restored {len(existing_events)} recent events from the Chronicles.",
+                style="angel.gold"
+            )
+
+
+def save_snapshot(force: bool = False):
+    """Compact the current graph into angel_state.json when due."""
+    if graph_is_complete and (force or scribe.snapshot_due()):
+        scribe.write_snapshot(wheels.to_snapshot())
+
 
 def display_proposal(proposal):
     """Display the proposal in a beautiful table."""
@@ -52,47 +113,85 @@ def display_proposal(proposal):
     console.print(table)
 
 
-def handle_change(file_path):
+def analyze_changes(file_paths):
     """
-    Triggered when the Eyes detect a file save.
-    Now includes Human-in-the-Loop confirmation.
+    Pipeline stage 1 (batches run concurrently): triggered when the Eyes
+    report settled file saves. One git invocation for every diff, the
+    Brain's analyses on its worker pool (each API request admitted by the
+    Halo first), and all work-unit/proposal events in one group commit.
+    Returns [(filename, proposal)] for confirmation, or None.
     """
     # A. Safety Check
     is_safe, msg = halo.check_safety()
     if not is_safe:
         voice.alert(f"HALO INTERVENTION: {msg}")
-        return
+        return None
 
-    # B. Record the work unit
-    filename = os.path.basename(file_path)
-    voice.speak(f"I perceive a shift in: [u]{filename}[/u]", style="angel.gold")
+    filenames = [os.path.basename(file_path) for file_path in file_paths]
+    if len(filenames) == 1:
+        voice.speak(f"I perceive a shift in: [u]{filenames[0]}[/u]", style="angel.gold")
+    else:
+        voice.speak(f"I perceive a shift in {len(filenames)} files.", style="angel.gold")
 
-    work_unit_event = AngelEvent(
-        action_type="WORK_UNIT_CAPTURED",
-        actor="AI_Agent",
-        file_path=filename
-    )
-    scribe.record(work_unit_event)
+    # B. The Brain analyzes intent (all diffs from one git run)
+    diffs = brain.get_diffs(file_paths)
+    results = [(os.path.basename(path), proposal) for path, proposal in brain.analyze_many(diffs)]
+
+    # C. Record the work units and proposals
+    events = []
+    for filename, proposal in results:
+        events.append(AngelEvent(
+            action_type="WORK_UNIT_CAPTURED",
+            actor="AI_Agent",
+            file_path=filename
+        ))
+        events.append(AngelEvent(
+            action_type="PROPOSAL_GENERATED",
+            actor="AI_Agent",
+            file_path=filename,
+            proposal_id=proposal.proposal_id
+        ))
+    scribe.record_many(events)
+    return results
+
+
+def confirm_proposals(results):
+    """
+    Pipeline stage 2 (one batch at a time): Human-in-the-Loop confirmation
+    of each proposal, then one group commit, one graph update and one render.
+    """
+    auto_confirm = config.get('brain', {}).get('auto_confirm', False)
+    events = []
+    edges = []
+    for filename, proposal in results:
+        event, edge = judge_proposal(filename, proposal, auto_confirm)
+        if event is not None:
+            events.append(event)
+        if edge is not None:
+            edges.append(edge)
 
-    # C. The Brain analyzes intent
-    proposal = brain.analyze_intent(file_path)
+    scribe.record_many(events)
+    for edge in edges:
+        wheels.add_edge(edge)
+    save_snapshot()
 
-    proposal_event = AngelEvent(
-        action_type="PROPOSAL_GENERATED",
-        actor="AI_Agent",
-        file_path=filename,
-        proposal_id=proposal.proposal_id
+    # F. Update visualization in the background (delta for open pages; full HTML on a timer)
+    renderer.request()
+    stats = wheels.get_stats()
+    voice.speak(
+        f"Constellation updated: {stats['files']} files, {stats['intents']} intents, {stats['edges']} links",
+        style="angel.pink"
     )
-    scribe.record(proposal_event)
 
+
+def judge_proposal(filename, proposal, auto_confirm):
+    """Ask the human about one proposal. Returns (event to record, edge to add)."""
     # D. Present proposal for human confirmation
     console.print()
     display_proposal(proposal)
     console.print()
 
     # E. Human-in-the-Loop: Get confirmation (or auto-confirm)
-    auto_confirm = config.get('brain', {}).get('auto_confirm', False)
-
     if auto_confirm:
         voice.speak("Auto-confirm enabled. Accepting proposal.", style="angel.gold")
         choice = "y"
@@ -114,9 +213,8 @@ def handle_change(file_path):
             explicit_approval=True,
             justification=proposal.rationale
         )
-        scribe.record(confirm_event)
-        wheels.add_edge(proposal.edge)
-        voice.speak("Relationship confirmed and recorded.", style="angel.pink")
+        voice.speak("Relationship confirmed.", style="angel.pink")
+        return confirm_event, proposal.edge
 
     elif choice == "n":
         # Rejected
@@ -127,8 +225,8 @@ def handle_change(file_path):
             proposal_id=proposal.proposal_id,
             explicit_approval=False
         )
-        scribe.record(reject_event)
         voice.speak("Proposal rejected. No changes made.", style="angel.gold")
+        return reject_event, None
 
     elif choice == "e":
         # Edit - provide custom intent
@@ -148,20 +246,14 @@ def handle_change(file_path):
                 explicit_approval=True,
                 justification=f"Human override: {custom_intent}"
             )
-            scribe.record(confirm_event)
-            wheels.add_edge(custom_edge)
-            voice.speak(f"Custom relationship recorded: {filename} → {custom_intent}", style="angel.pink")
+            voice.speak(f"Custom relationship: {filename} → {custom_intent}", style="angel.pink")
+            return confirm_event, custom_edge
 
-    # F. Update visualization
-    map_file = wheels.manifest()
-    stats = wheels.get_stats()
-    voice.speak(
-        f"Constellation updated: {stats['files']} files, {stats['intents']} intents, {stats['edges']} links",
-        style="angel.pink"
-    )
+    return None, None
 
 
 def main():
+    awaken()
     auto_confirm = config.get('brain', {}).get('auto_confirm', False)
     mode_text = "AUTO-CONFIRM MODE" if auto_confirm else "[Y]es / [N]o / [E]dit to respond"
 
@@ -180,13 +272,40 @@ def main():
             style="angel.gold"
         )
 
-    # Initialize Eyes
+    # Initialize the pipeline: Eyes -> Choir (debounce, analyze, confirm) -> RenderWorker
+    pipeline_config = config.get("pipeline", {})
+    choir = TheChoir(
+        analyze=analyze_changes,
+        confirm=confirm_proposals,
+        debounce_interval=config['vision']['debounce_seconds'],
+        max_concurrency=pipeline_config.get("max_concurrency", 4)
+    )
+    choir.start()
+
+    # Initialize Eyes (debouncing happens in the Choir)
     eyes = VisionSystem(
         path=config['vision']['watch_path'],
-        callback=handle_change,
-        config=config
+        config=config,
+        on_path=choir.submit
     )
 
+    renderer.start()
+
+    # Live event stream for open pages / tools (opt-in)
+    trumpet = None
+    trumpet_config = config.get("trumpet", {})
+    if trumpet_config.get("enabled"):
+        trumpet = TheTrumpet(
+            scribe,
+            host=trumpet_config.get("host", "127.0.0.1"),
+            port=trumpet_config.get("port", 8765),
+            poll_interval=trumpet_config.get("poll_interval", 0.25),
+            client_queue=trumpet_config.get("client_queue", 256),
+            drain_timeout=trumpet_config.get("drain_timeout", 1.0)
+        )
+        trumpet.start()
+        voice.speak(f"Trumpet sounding on http://{trumpet.host}:{trumpet.port}/events", style="angel.gold")
+
     eyes.open_eyes()
 
     try:
@@ -201,6 +320,36 @@ def main():
         voice.speak("\nReturning to the ether...", style="angel.pink")
     finally:
         eyes.close_eyes()
+        # Don't wait on a pending confirmation prompt; nothing half-done is recorded
+        choir.stop(flush=False, timeout=5)
+        if trumpet is not None:
+            trumpet.stop(timeout=5)
+        save_snapshot(force=True)
+        scribe.close()
+        renderer.stop(flush=True)
+        wheels.save_layout()
+        render_stats = renderer.metrics()
+        if render_stats["renders"]:
+            voice.speak(
+                f"Rendered {render_stats['renders']} times for {render_stats['requests']} requests "
+                f"(avg {render_stats['avg_latency'] * 1000:.0f} ms, max {render_stats['max_latency'] * 1000:.0f} ms)",
+                style="angel.gold"
+            )
+        brain.close()
+        if brain.memory is not None:
+            cache_stats = brain.memory.metrics()
+            voice.speak(
+                f"Analysis cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['entries']} remembered)",
+                style="angel.gold"
+            )
+        if brain.sentinel is not None and brain.sentinel.scans:
+            scan_stats = brain.sentinel.metrics()
+            voice.speak(
+                f"Secret scans: {scan_stats['scans']} diffs, {scan_stats['hunk_cache_hits']} cached hunks "
+                f"(avg {scan_stats['avg_ms']:.1f} ms, max {scan_stats['max_ms']:.1f} ms)",
+                style="angel.gold"
+            )
         # Final stats
         stats = wheels.get_stats()
         voice.speak(
@@ -0,0 +1,57 @@
+import subprocess
+
+import pytest
+
+from angel.mirror import TheMirror
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=Angel", "-c", "user.email=angel@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def _repo_with_crlf_file(tmp_path, autocrlf):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "core.autocrlf", autocrlf)
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"a\r\nb\r\nc\r\n")
+    _git(tmp_path, "add", "notes.txt")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    path.write_bytes(b"a\r\nb\r\nc\r\nd\r\n")
+    return path
+
+
+def test_crlf_file_under_autocrlf_is_left_to_git(tmp_path):
+    path = _repo_with_crlf_file(tmp_path, "true")
+    mirror = TheMirror()
+    try:
+        with pytest.raises(RuntimeError):
+            mirror.diff(str(path))
+    finally:
+        mirror.close()
+    # What the caller falls back to: one added line, not a rewrite
+    diff = subprocess.run(["git", "diff", "HEAD", "--", "notes.txt"], cwd=tmp_path,
+                          capture_output=True, text=True, check=True).stdout
+    assert [line for line in diff.splitlines() if line[:1] in "+-" and line[:3] not in ("+++", "---")] == ["+d"]
+
+
+def test_crlf_file_with_text_attribute_is_left_to_git(tmp_path):
+    (tmp_path / ".gitattributes").write_text("*.txt text eol=crlf\n")
+    path = _repo_with_crlf_file(tmp_path, "false")
+    mirror = TheMirror()
+    try:
+        with pytest.raises(RuntimeError):
+            mirror.diff(str(path))
+    finally:
+        mirror.close()
+
+
+def test_unconverted_crlf_file_is_diffed_in_process(tmp_path):
+    path = _repo_with_crlf_file(tmp_path, "false")
+    mirror = TheMirror()
+    try:
+        diff = mirror.diff(str(path))
+    finally:
+        mirror.close()
+    changed = [line for line in diff.splitlines() if line[:1] in "+-" and line[:3] not in ("+++", "---")]
+    assert changed == ["+d"]
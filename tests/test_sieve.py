@@ -0,0 +1,33 @@
+import random
+
+from angel.sieve import TheSieve, estimate_tokens
+
+
+def _many_hunk_diff(rng, hunks, max_line_chars=400):
+    lines = ["diff --git a/app.py b/app.py\n", "--- a/app.py\n", "+++ b/app.py\n"]
+    for h in range(hunks):
+        lines.append(f"@@ -{h * 50 + 10},6 +{h * 50 + 10},7 @@ def handler_{h}():\n")
+        for _ in range(rng.randint(1, 12)):
+            sign = rng.choice(" +-")
+            lines.append(sign + "x" * rng.randint(0, max_line_chars) + "\n")
+    return "".join(lines)
+
+
+def test_many_hunk_diff_fits_default_budget():
+    sieve = TheSieve()
+    diff = _many_hunk_diff(random.Random(0), 150)
+    sent, note = sieve.sift("app.py", diff)
+    assert note is not None
+    assert len(sent) <= sieve.max_tokens * 4
+    assert estimate_tokens(sent) <= sieve.max_tokens
+
+
+def test_random_many_hunk_diffs_never_exceed_budget():
+    rng = random.Random(1)
+    for _ in range(300):
+        max_tokens = rng.choice([50, 200, 500, 2000])
+        sieve = TheSieve(max_tokens=max_tokens, max_line_chars=rng.choice([40, 240]))
+        diff = _many_hunk_diff(rng, rng.randint(1, 200))
+        sent, _ = sieve.sift("app.py", diff)
+        assert len(sent) <= max_tokens * 4
+        assert estimate_tokens(sent) <= max_tokens
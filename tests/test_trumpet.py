@@ -0,0 +1,44 @@
+import socket
+import time
+
+from angel.chronicles import TheScribe
+from angel.trumpet import TheTrumpet
+from angel.types import AngelEvent
+
+
+def _read_events(sock, expected, timeout=10.0):
+    """Count `angel` messages on an SSE socket until `expected` arrive or `timeout` passes."""
+    sock.settimeout(0.2)
+    data = b""
+    deadline = time.monotonic() + timeout
+    while data.count(b"event: angel\n") < expected and time.monotonic() < deadline:
+        try:
+            chunk = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not chunk:
+            break
+        data += chunk
+    return data.count(b"event: angel\n")
+
+
+def test_fast_consumer_survives_burst_larger_than_queue(tmp_path):
+    scribe = TheScribe(str(tmp_path / "c.jsonl"), snapshot_path=str(tmp_path / "s.json"))
+    trumpet = TheTrumpet(TheScribe(str(tmp_path / "c.jsonl"), snapshot_path=str(tmp_path / "s.json")),
+                         port=0, poll_interval=0.05, client_queue=16)
+    trumpet.start()
+    try:
+        with socket.create_connection(("127.0.0.1", trumpet.port)) as sock:
+            sock.sendall(b"GET /events HTTP/1.1\r\n\r\n")
+            deadline = time.monotonic() + 5
+            while trumpet.metrics()["clients"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            scribe.record_many(AngelEvent(action_type="WORK_UNIT_CAPTURED", file_path=f"f{i}.py") for i in range(300))
+            scribe.flush()
+
+            assert _read_events(sock, 300) == 300
+        assert trumpet.metrics()["dropped"] == 0
+    finally:
+        trumpet.stop(5)
+        scribe.close()